@@ -0,0 +1,119 @@
+"""Runs voice processing on a worker thread, off the audio callback."""
+import threading
+import time
+import numpy as np
+from typing import Callable, Optional
+from ring_buffer import SPSCRingBuffer
+
+
+class AsyncProcessor:
+    """Decouples the real-time audio callback from the effect chain.
+
+    The callback only copies chunks into an input ring and out of an output
+    ring; a worker thread runs the processing function in between. Output
+    starts once `preroll` processed chunks are buffered, which absorbs
+    processing jitter at the cost of `preroll` chunks of extra latency.
+
+    With block_chunks > 1 the worker gathers that many chunks and processes
+    them as one block, amortizing per-call overhead; process_fn must then
+    accept and return blocks of chunk_size * block_chunks samples.
+    """
+
+    def __init__(self, process_fn: Callable[[np.ndarray], np.ndarray],
+                 sample_rate: int = 44100, chunk_size: int = 1024,
+                 num_slots: int = 8, preroll: int = 2, block_chunks: int = 1):
+        self.process_fn = process_fn
+        self.chunk_size = chunk_size
+        self.block_chunks = block_chunks
+        # Processed chunks arrive a block at a time, so buffer at least one
+        self.preroll = max(preroll, block_chunks)
+
+        self.input_ring = SPSCRingBuffer(num_slots, chunk_size)
+        self.output_ring = SPSCRingBuffer(num_slots, chunk_size)
+
+        # Buffers handed back to the audio callback
+        self._out = np.zeros(chunk_size, dtype=np.float32)
+        self._silence = np.zeros(chunk_size, dtype=np.float32)
+        self._primed = False
+
+        # Input gathered by the worker until a full block is ready
+        self._block = np.zeros(chunk_size * block_chunks, dtype=np.float32)
+
+        # Sleep a fraction of a chunk period while waiting for input
+        self._idle_wait = chunk_size / sample_rate / 4
+
+        self.is_running = False
+        self.worker_thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the worker thread."""
+        if self.is_running:
+            return
+
+        self.input_ring.clear()
+        self.output_ring.clear()
+        self._primed = False
+
+        self.is_running = True
+        self.worker_thread = threading.Thread(target=self._worker_func, daemon=True)
+        self.worker_thread.start()
+
+    def stop(self):
+        """Stop the worker thread."""
+        self.is_running = False
+        if self.worker_thread:
+            self.worker_thread.join(timeout=1.0)
+            self.worker_thread = None
+
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        """Queue a chunk for processing and return the oldest processed chunk.
+
+        Called from the audio callback: only copies, never blocks.
+        """
+        self.input_ring.push(audio)
+
+        # Output silence until enough processed audio is buffered
+        if not self._primed:
+            if len(self.output_ring) < self.preroll:
+                return self._silence[:len(audio)]
+            self._primed = True
+
+        chunk = self.output_ring.peek()
+        if chunk is None:
+            # The worker fell behind: play silence and build the preroll again
+            self._primed = False
+            return self._silence[:len(audio)]
+
+        out = self._out[:len(chunk)]
+        np.copyto(out, chunk)
+        self.output_ring.advance()
+        return out
+
+    def _worker_func(self):
+        """Worker thread that runs the processing function."""
+        block = self._block
+        filled = 0  # Samples gathered into the current block
+        gathered = 0  # Chunks gathered into the current block
+        while self.is_running:
+            chunk = self.input_ring.peek()
+            if chunk is None:
+                time.sleep(self._idle_wait)
+                continue
+
+            block[filled:filled + len(chunk)] = chunk
+            filled += len(chunk)
+            gathered += 1
+            self.input_ring.advance()
+            if gathered < self.block_chunks:
+                continue
+
+            try:
+                processed = self.process_fn(block[:filled])
+            except Exception as e:
+                print(f"Processing error: {e}")
+                processed = block[:filled]
+
+            for start in range(0, filled, self.chunk_size):
+                self.output_ring.push(processed[start:start + self.chunk_size])
+            filled = 0
+            gathered = 0
@@ -1,9 +1,134 @@
 """Audio engine for real-time capture and playback."""
 import pyaudio  # type: ignore
 import numpy as np
+import gc
+import os
+import sys
 import threading
 import queue
+import collections
+import time
 from typing import Optional, Callable, List, Tuple
+from ring_buffer import SPSCRingBuffer
+
+def _raise_thread_priority() -> bool:
+    """Best-effort promotion of the calling thread to real-time priority.
+    
+    Returns False if the platform refused (e.g. no CAP_SYS_NICE on Linux).
+    """
+    try:
+        if sys.platform.startswith("linux"):
+            # On Linux pid 0 targets the calling thread, not the whole process
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(80))
+        elif sys.platform == "win32":
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            THREAD_PRIORITY_TIME_CRITICAL = 15
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_TIME_CRITICAL)
+            # Also register with MMCSS so the scheduler treats us as audio
+            task_index = ctypes.c_ulong(0)
+            ctypes.windll.avrt.AvSetMmThreadCharacteristicsW("Pro Audio", ctypes.byref(task_index))
+        elif sys.platform == "darwin":
+            import ctypes
+            libsystem = ctypes.CDLL("/usr/lib/libSystem.dylib")
+            QOS_CLASS_USER_INTERACTIVE = 0x21
+            if libsystem.pthread_set_qos_class_self_np(QOS_CLASS_USER_INTERACTIVE, 0) != 0:
+                return False
+        else:
+            return False
+    except (OSError, AttributeError):
+        return False
+    return True
+
+
+# int16 <-> float32 scale factors, kept as float32 so NumPy never promotes
+# the audio to float64 on the way through
+_INV_32768 = np.float32(1.0 / 32768.0)
+_SCALE_32768 = np.float32(32768.0)
+
+
+# Messages the audio threads can report. They only queue an id and an
+# argument; formatting and printing happen on the engine's log thread.
+_LOG_STREAM_STATUS = 0
+_LOG_INPUT_STATUS = 1
+_LOG_PROCESSING_ERROR = 2
+_LOG_OUTPUT_ERROR = 3
+
+_LOG_FORMATS = {
+    _LOG_STREAM_STATUS: "Stream status: {}",
+    _LOG_INPUT_STATUS: "Input status: {}",
+    _LOG_PROCESSING_ERROR: "Processing error: {}",
+    _LOG_OUTPUT_ERROR: "Output error: {}",
+}
+
+
+# Numba is optional: the fused kernels fall back to plain NumPy without it
+try:
+    from numba import njit  # type: ignore
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _peak(x):
+        """Peak absolute value in a single pass, without temporaries."""
+        peak = 0.0
+        for i in range(x.shape[0]):
+            a = abs(x[i])
+            if a > peak:
+                peak = a
+        return peak
+    
+    # The conversion kernels stay in single precision so LLVM can vectorize the
+    # int16 <-> float32 convert-and-scale at full SIMD width. They walk
+    # interleaved samples, so any channel count works unchanged, and
+    # cache=True keeps the compiled code on disk between launches.
+    @njit(cache=True, fastmath=True)
+    def _decode_and_level(in_i16, out_f32):
+        """Convert int16 samples to float32 and return the peak level in one pass."""
+        peak = np.float32(0.0)
+        for i in range(in_i16.shape[0]):
+            v = np.float32(in_i16[i]) * _INV_32768
+            out_f32[i] = v
+            a = abs(v)
+            if a > peak:
+                peak = a
+        return peak
+
+    @njit(cache=True, fastmath=True)
+    def _encode_i16(processed, out_i16):
+        """Convert float samples to int16 and return the peak level in one pass.
+        
+        Samples outside [-1, 1) saturate instead of wrapping around.
+        """
+        lo = np.float32(-32768.0)
+        hi = np.float32(32767.0)
+        peak = np.float32(0.0)
+        for i in range(processed.shape[0]):
+            v = np.float32(processed[i])
+            out_i16[i] = np.int16(min(max(v * _SCALE_32768, lo), hi))
+            a = abs(v)
+            if a > peak:
+                peak = a
+        return peak
+else:
+    def _peak(x):
+        """Peak absolute value without allocating an abs() temporary."""
+        return max(float(x.max()), -float(x.min()))
+
+    def _decode_and_level(in_i16, out_f32):
+        """Convert int16 samples to float32 and return the peak level."""
+        np.multiply(in_i16, _INV_32768, out=out_f32)
+        return _peak(out_f32)
+
+    def _encode_i16(processed, out_i16):
+        """Convert float samples to int16 (saturating) and return the peak level."""
+        scaled = np.multiply(processed, _SCALE_32768, dtype=np.float32)
+        np.clip(scaled, -32768.0, 32767.0, out=scaled)
+        out_i16[:] = scaled
+        return _peak(processed)
 
 
 class AudioEngine:
@@ -17,6 +142,9 @@ class AudioEngine:
         self.input_device_index: Optional[int] = None
         self.output_device_index: Optional[int] = None
         
+        # Cached (input, output) device lists
+        self._device_cache: Optional[Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]] = None
+        
         self.input_stream: Optional[pyaudio.Stream] = None
         self.output_stream: Optional[pyaudio.Stream] = None
         
@@ -37,24 +165,33 @@ class AudioEngine:
         # Threads
         self.input_thread: Optional[threading.Thread] = None
         self.output_thread: Optional[threading.Thread] = None
+        self._stop_evt = threading.Event()
+    
+    def _get_devices(self) -> Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]:
+        """Enumerate input and output devices once and cache the result."""
+        if self._device_cache is None:
+            inputs = []
+            outputs = []
+            for i in range(self.audio.get_device_count()):
+                info = self.audio.get_device_info_by_index(i)
+                if info['maxInputChannels'] > 0:
+                    inputs.append((i, info['name']))
+                if info['maxOutputChannels'] > 0:
+                    outputs.append((i, info['name']))
+            self._device_cache = (inputs, outputs)
+        return self._device_cache
+    
+    def invalidate_devices(self):
+        """Forget cached device lists so the next query re-enumerates."""
+        self._device_cache = None
     
     def get_input_devices(self) -> List[Tuple[int, str]]:
         """Get list of available input devices."""
-        devices = []
-        for i in range(self.audio.get_device_count()):
-            info = self.audio.get_device_info_by_index(i)
-            if info['maxInputChannels'] > 0:
-                devices.append((i, info['name']))
-        return devices
+        return self._get_devices()[0]
     
     def get_output_devices(self) -> List[Tuple[int, str]]:
         """Get list of available output devices."""
-        devices = []
-        for i in range(self.audio.get_device_count()):
-            info = self.audio.get_device_info_by_index(i)
-            if info['maxOutputChannels'] > 0:
-                devices.append((i, info['name']))
-        return devices
+        return self._get_devices()[1]
     
     def set_input_device(self, device_index: int):
         """Set the input device."""
@@ -84,10 +221,11 @@ class AudioEngine:
             print(f"Input status: {status}")
         
         # Convert bytes to numpy array
-        audio_data = np.frombuffer(in_data, dtype=np.int16).astype(np.float32) / 32768.0
+        audio_data = np.frombuffer(in_data, dtype=np.int16).astype(np.float32)
+        np.multiply(audio_data, _INV_32768, out=audio_data)
         
         # Calculate input level
-        self.input_level = np.abs(audio_data).max()
+        self.input_level = _peak(audio_data)
         
         # Process audio if callback is set and not bypassed
         if self.process_callback and not self.bypass:
@@ -100,10 +238,10 @@ class AudioEngine:
             processed = audio_data
         
         # Calculate output level
-        self.output_level = np.abs(processed).max()
+        self.output_level = _peak(processed)
         
         # Convert back to int16
-        output_data = (processed * 32768.0).astype(np.int16).tobytes()
+        output_data = (processed * _SCALE_32768).astype(np.int16).tobytes()
         
         return (output_data, pyaudio.paContinue)
     
@@ -122,10 +260,9 @@ class AudioEngine:
             
             self.input_stream.start_stream()
             
-            # Keep thread alive
-            while self.is_running and self.input_stream.is_active():
-                import time
-                time.sleep(0.1)
+            # Keep thread alive until stop() wakes us
+            while not self._stop_evt.wait(0.1) and self.input_stream.is_active():
+                pass
         except Exception as e:
             print(f"Input stream error: {e}")
     
@@ -143,6 +280,7 @@ class AudioEngine:
             return
         
         self.is_running = True
+        self._stop_evt.clear()
         
         # Start input thread
         self.input_thread = threading.Thread(target=self._input_thread_func, daemon=True)
@@ -170,6 +308,7 @@ class AudioEngine:
     def stop(self):
         """Stop audio processing."""
         self.is_running = False
+        self._stop_evt.set()
         
         if self.input_stream:
             try:
@@ -209,22 +348,34 @@ class AudioEngine:
 class AudioEngineV2:
     """Improved audio engine with proper input/output separation."""
     
-    def __init__(self, sample_rate: int = 44100, chunk_size: int = 1024):
+    def __init__(self, sample_rate: int = 44100, chunk_size: int = 1024, channels: int = 1):
         self.sample_rate = sample_rate
         self.chunk_size = chunk_size
+        self.channels = channels
         self.audio = pyaudio.PyAudio()
         
         self.input_device_index: Optional[int] = None
         self.output_device_index: Optional[int] = None
         
+        # Cached (input, output) device lists
+        self._device_cache: Optional[Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]] = None
+        
         self.input_stream: Optional[pyaudio.Stream] = None
         self.output_stream: Optional[pyaudio.Stream] = None
+        self.duplex_stream: Optional[pyaudio.Stream] = None
         
         self.is_running = False
         self.bypass = False
         
-        # Audio queue for processed audio
-        self.output_queue = queue.Queue(maxsize=20)
+        # Buffers hold interleaved samples, chunk_size frames of `channels` each
+        samples_per_chunk = chunk_size * channels
+        
+        # Lock-free ring of processed audio (input callback -> output thread)
+        self.output_ring = SPSCRingBuffer(num_slots=20, chunk_size=samples_per_chunk)
+        
+        # Preallocated conversion buffers (input callback / output thread)
+        self._in_f32 = np.empty(samples_per_chunk, dtype=np.float32)
+        self._out_i16 = np.empty(samples_per_chunk, dtype=np.int16)
         
         # Processing callback
         self.process_callback: Optional[Callable[[np.ndarray], np.ndarray]] = None
@@ -235,24 +386,41 @@ class AudioEngineV2:
         
         # Threads
         self.output_thread: Optional[threading.Thread] = None
+        
+        # Whether the PortAudio callback thread has been promoted yet
+        self._callback_priority_set = False
+        
+        # Messages from the audio threads; deque appends/pops are atomic, so
+        # the callbacks never block on stdout. Oldest entries drop when full.
+        self._rt_log: collections.deque = collections.deque(maxlen=64)
+        self._log_thread: Optional[threading.Thread] = None
+        self._log_stop = threading.Event()
+    
+    def _get_devices(self) -> Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]:
+        """Enumerate input and output devices once and cache the result."""
+        if self._device_cache is None:
+            inputs = []
+            outputs = []
+            for i in range(self.audio.get_device_count()):
+                info = self.audio.get_device_info_by_index(i)
+                if info['maxInputChannels'] > 0:
+                    inputs.append((i, info['name']))
+                if info['maxOutputChannels'] > 0:
+                    outputs.append((i, info['name']))
+            self._device_cache = (inputs, outputs)
+        return self._device_cache
+    
+    def invalidate_devices(self):
+        """Forget cached device lists so the next query re-enumerates."""
+        self._device_cache = None
     
     def get_input_devices(self) -> List[Tuple[int, str]]:
         """Get list of available input devices."""
-        devices = []
-        for i in range(self.audio.get_device_count()):
-            info = self.audio.get_device_info_by_index(i)
-            if info['maxInputChannels'] > 0:
-                devices.append((i, info['name']))
-        return devices
+        return self._get_devices()[0]
     
     def get_output_devices(self) -> List[Tuple[int, str]]:
         """Get list of available output devices."""
-        devices = []
-        for i in range(self.audio.get_device_count()):
-            info = self.audio.get_device_info_by_index(i)
-            if info['maxOutputChannels'] > 0:
-                devices.append((i, info['name']))
-        return devices
+        return self._get_devices()[1]
     
     def set_input_device(self, device_index: int):
         """Set the input device."""
@@ -276,61 +444,87 @@ class AudioEngineV2:
         """Set bypass mode."""
         self.bypass = bypass
     
-    def _input_callback(self, in_data, frame_count, time_info, status):
-        """Callback for audio input."""
-        if status:
-            print(f"Input status: {status}")
-        
-        # Convert to numpy
-        audio_data = np.frombuffer(in_data, dtype=np.int16).astype(np.float32) / 32768.0
-        
-        # Update input level
-        self.input_level = np.abs(audio_data).max()
+    def _process_input(self, in_data, frame_count) -> np.ndarray:
+        """Decode an input chunk, update the input level and run the processor."""
+        # Convert to float32 and measure input level in a single pass
+        audio_data = self._in_f32[:frame_count * self.channels]
+        self.input_level = _decode_and_level(np.frombuffer(in_data, dtype=np.int16), audio_data)
         
         # Process if not bypassed
         if not self.bypass and self.process_callback:
             try:
-                processed = self.process_callback(audio_data)
+                return self.process_callback(audio_data)
             except Exception as e:
-                print(f"Processing error: {e}")
-                processed = audio_data
-        else:
-            processed = audio_data
+                self._rt_log.append((_LOG_PROCESSING_ERROR, e))
+        return audio_data
+    
+    def _duplex_callback(self, in_data, frame_count, time_info, status):
+        """Callback for the full-duplex stream: process input and return it as output."""
+        if not self._callback_priority_set:
+            self._callback_priority_set = True
+            _raise_thread_priority()
         
-        # Update output level
-        self.output_level = np.abs(processed).max()
+        if status:
+            self._rt_log.append((_LOG_STREAM_STATUS, status))
         
-        # Queue for output
-        try:
-            self.output_queue.put_nowait(processed)
-        except queue.Full:
-            # Drop oldest if queue is full
-            try:
-                self.output_queue.get_nowait()
-                self.output_queue.put_nowait(processed)
-            except Exception:
-                pass
+        processed = self._process_input(in_data, frame_count)
+        
+        # Convert to int16 and measure output level in a single pass
+        # Never past the preallocated buffer: the njit kernel doesn't bounds-check
+        n = min(len(processed), len(self._out_i16))
+        out_i16 = self._out_i16[:n]
+        self.output_level = _encode_i16(processed[:n], out_i16)
+        
+        # PyAudio reads any buffer-protocol object, so hand it the
+        # preallocated array instead of allocating a bytes copy
+        return (out_i16, pyaudio.paContinue)
+    
+    def _input_callback(self, in_data, frame_count, time_info, status):
+        """Callback for audio input (separate-stream mode)."""
+        if not self._callback_priority_set:
+            self._callback_priority_set = True
+            _raise_thread_priority()
+        
+        if status:
+            self._rt_log.append((_LOG_INPUT_STATUS, status))
+        
+        processed = self._process_input(in_data, frame_count)
+        
+        # Hand off to the output thread; overflow is counted, never raised
+        self.output_ring.push(processed)
         
         # Input-only streams should return None, not a tuple
         return None
     
     def _output_thread_func(self):
         """Output thread that plays processed audio."""
+        if not _raise_thread_priority():
+            print("Could not raise output thread priority; audio may glitch under load")
+        
+        # Sleep a fraction of a chunk period while waiting for input
+        idle_wait = self.chunk_size / self.sample_rate / 4
+        
         while self.is_running:
             try:
-                # Get processed audio from queue
-                processed = self.output_queue.get(timeout=0.1)
+                # Get processed audio from the ring
+                processed = self.output_ring.peek()
+                if processed is None:
+                    time.sleep(idle_wait)
+                    continue
                 
-                # Convert to int16
-                output_data = (processed * 32768.0).astype(np.int16).tobytes()
+                # Convert to int16 and measure output level in a single pass
+                # Never past the preallocated buffer: the njit kernel doesn't bounds-check
+                n = min(len(processed), len(self._out_i16))
+                out_i16 = self._out_i16[:n]
+                self.output_level = _encode_i16(processed[:n], out_i16)
+                self.output_ring.advance()
                 
-                # Write to output stream
+                # Write straight from the preallocated buffer; num_frames must
+                # be explicit since len() counts samples rather than bytes
                 if self.output_stream and self.output_stream.is_active():
-                    self.output_stream.write(output_data)
-            except queue.Empty:
-                continue
+                    self.output_stream.write(out_i16, num_frames=len(out_i16) // self.channels)
             except Exception as e:
-                print(f"Output error: {e}")
+                self._rt_log.append((_LOG_OUTPUT_ERROR, e))
     
     def start(self):
         """Start audio processing."""
@@ -341,13 +535,53 @@ class AudioEngineV2:
             print("Please select input and output devices first")
             return
         
+        # Compile the conversion kernels now so the first callback isn't blocked
+        self._warm_up_kernels()
+        
+        # Move existing objects out of the collector's reach so GC passes
+        # triggered on the audio threads stay short; stop() unfreezes them
+        gc.collect()
+        gc.freeze()
+        
         self.is_running = True
+        self._callback_priority_set = False
         
+        # Start log thread
+        self._log_stop.clear()
+        self._log_thread = threading.Thread(target=self._log_thread_func, daemon=True)
+        self._log_thread.start()
+        
+        # Prefer a single full-duplex stream: no ring buffer hop, no output
+        # thread and one chunk less latency
+        try:
+            self.duplex_stream = self.audio.open(
+                format=pyaudio.paInt16,
+                channels=self.channels,
+                rate=self.sample_rate,
+                input=True,
+                output=True,
+                input_device_index=self.input_device_index,
+                output_device_index=self.output_device_index,
+                frames_per_buffer=self.chunk_size,
+                stream_callback=self._duplex_callback,
+            )
+            self.duplex_stream.start_stream()
+            return
+        except Exception as e:
+            # Some host APIs can't pair the two devices in one stream
+            print(f"Duplex stream unavailable ({e}), using separate input/output streams")
+            self._close_stream(self.duplex_stream)
+            self.duplex_stream = None
+        
+        self._start_separate_streams()
+    
+    def _start_separate_streams(self):
+        """Open separate input/output streams joined by the ring and output thread."""
         # Open input stream
         try:
             self.input_stream = self.audio.open(
                 format=pyaudio.paInt16,
-                channels=1,
+                channels=self.channels,
                 rate=self.sample_rate,
                 input=True,
                 input_device_index=self.input_device_index,
@@ -364,7 +598,7 @@ class AudioEngineV2:
         try:
             self.output_stream = self.audio.open(
                 format=pyaudio.paInt16,
-                channels=1,
+                channels=self.channels,
                 rate=self.sample_rate,
                 output=True,
                 output_device_index=self.output_device_index,
@@ -379,36 +613,73 @@ class AudioEngineV2:
         self.output_thread = threading.Thread(target=self._output_thread_func, daemon=True)
         self.output_thread.start()
     
+    def _drain_rt_log(self):
+        """Print messages queued by the audio threads."""
+        while self._rt_log:
+            msg_id, arg = self._rt_log.popleft()
+            print(_LOG_FORMATS[msg_id].format(arg))
+    
+    def _log_thread_func(self):
+        """Log thread that prints audio-thread messages off the real-time path."""
+        while not self._log_stop.wait(0.25):
+            self._drain_rt_log()
+        self._drain_rt_log()
+    
+    def _warm_up_kernels(self):
+        """Compile every kernel specialization the callbacks can hit.
+        
+        Numba compiles a new specialization per argument type on first use,
+        so anything not covered here would be compiled on the audio thread.
+        """
+        # frombuffer() views are read-only, which Numba compiles separately
+        dummy_in = np.frombuffer(bytes(self._in_f32.nbytes // 2), dtype=np.int16)
+        _decode_and_level(dummy_in, self._in_f32)
+        
+        # The processor may hand back float32 or float64 chunks
+        for dtype in (np.float32, np.float64):
+            dummy_out = np.zeros(len(self._out_i16), dtype=dtype)
+            _encode_i16(dummy_out, self._out_i16)
+            _peak(dummy_out)
+    
+    @staticmethod
+    def _close_stream(stream: Optional[pyaudio.Stream]):
+        """Stop and close a stream, ignoring errors."""
+        if stream:
+            try:
+                stream.stop_stream()
+                stream.close()
+            except Exception:
+                pass
+    
     def stop(self):
         """Stop audio processing."""
         self.is_running = False
         
-        if self.input_stream:
-            try:
-                self.input_stream.stop_stream()
-                self.input_stream.close()
-            except Exception:
-                pass
-            self.input_stream = None
+        self._close_stream(self.duplex_stream)
+        self.duplex_stream = None
         
-        if self.output_stream:
-            try:
-                self.output_stream.stop_stream()
-                self.output_stream.close()
-            except Exception:
-                pass
-            self.output_stream = None
+        self._close_stream(self.input_stream)
+        self.input_stream = None
+        
+        self._close_stream(self.output_stream)
+        self.output_stream = None
         
         if self.output_thread:
             self.output_thread.join(timeout=1.0)
             self.output_thread = None
         
-        # Clear queue
-        while not self.output_queue.empty():
-            try:
-                self.output_queue.get_nowait()
-            except Exception:
-                break
+        if self._log_thread:
+            self._log_stop.set()
+            self._log_thread.join(timeout=1.0)
+            self._log_thread = None
+        
+        # Hand the objects frozen by start() back to the collector. Left
+        # frozen, anything that became garbage since (old streams, closures,
+        # presets) would never be freed, and every restart would add more
+        gc.unfreeze()
+        
+        # Clear ring (also resets the drop counters)
+        self.output_ring.clear()
     
     def get_input_level(self) -> float:
         """Get current input level."""
@@ -418,6 +689,10 @@ class AudioEngineV2:
         """Get current output level."""
         return self.output_level
     
+    def get_dropped_frames(self) -> int:
+        """Get the number of frames dropped because the output side fell behind."""
+        return self.output_ring.dropped * self.chunk_size
+    
     def cleanup(self):
         """Clean up resources."""
         self.stop()
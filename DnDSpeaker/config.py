@@ -1,10 +1,14 @@
 """Configuration management for DnDSpeaker."""
 import json
 import os
+import threading
 from typing import Optional, Dict, Any
 
 CONFIG_FILE = "dndspeaker_config.json"
 
+# Seconds to wait after the last change before writing to disk
+SAVE_DELAY = 0.5
+
 
 class Config:
     """Manages application settings persistence."""
@@ -27,6 +31,14 @@ class Config:
             "volume": 1.0,
         }
         self.config = self.load()
+        
+        # Pending deferred save; bursts of set() calls collapse into one write
+        self._lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
+        self._dirty = False
+        # Held from serializing until the file is swapped in, so writes never
+        # overlap on the temp file and flush() can wait out one in progress
+        self._write_lock = threading.Lock()
     
     def load(self) -> Dict[str, Any]:
         """Load configuration from file or return defaults."""
@@ -45,20 +57,55 @@ class Config:
     
     def save(self):
         """Save current configuration to file."""
+        with self._write_lock:
+            self._write()
+    
+    def _write(self):
+        """Write the configuration out; the caller holds _write_lock."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            self._dirty = False
+            data = json.dumps(self.config, indent=2)
+        
+        # Write to a temp file and swap it in so a crash never leaves a
+        # half-written config behind
+        tmp_path = self.config_path + ".tmp"
         try:
-            with open(self.config_path, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            with open(tmp_path, 'w') as f:
+                f.write(data)
+            os.replace(tmp_path, self.config_path)
         except Exception as e:
             print(f"Error saving config: {e}")
     
+    def _schedule_save(self):
+        """Save in the background once changes stop arriving."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def flush(self):
+        """Write any pending changes immediately, after any write already under way."""
+        with self._write_lock:
+            with self._lock:
+                dirty = self._dirty
+            if dirty:
+                self._write()
+    
     def get(self, key: str, default: Any = None) -> Any:
         """Get a configuration value."""
         return self.config.get(key, default)
     
     def set(self, key: str, value: Any):
-        """Set a configuration value."""
-        self.config[key] = value
-        self.save()
+        """Set a configuration value (persisted shortly afterwards)."""
+        with self._lock:
+            self.config[key] = value
+            self._dirty = True
+        self._schedule_save()
     
     def get_hotkey_voice(self, hotkey: str) -> Optional[str]:
         """Get voice name for a hotkey."""
@@ -1,41 +1,53 @@
 """GUI for DnDSpeaker application."""
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Optional, Callable, List, Tuple
+from typing import Optional, Callable, Dict, List, Tuple
 import threading
 
 
 class LevelMeter(tk.Canvas):
     """Visual level meter for audio."""
     
+    SEGMENTS = 20
+    OFF_COLOR = "#222222"
+    
     def __init__(self, parent, width=200, height=20, **kwargs):
         super().__init__(parent, width=width, height=height, **kwargs)
         self.width = width
         self.height = height
         self.level = 0.0
         
-        # Draw background
-        self.create_rectangle(0, 0, width, height, fill="#333333", outline="")
-        
-        # Draw segments
-        self.segments = []
-        for i in range(20):
-            x1 = i * (width / 20)
-            x2 = (i + 1) * (width / 20)
-            color = "#00ff00" if i < 15 else "#ffff00" if i < 18 else "#ff0000"
-            seg = self.create_rectangle(x1, 0, x2, height, fill="#222222", outline="")
-            self.segments.append((seg, color))
+        # The meter is a single image; each pixel column takes the color of
+        # the segment it falls in, so a refresh is one PhotoImage.put()
+        self._img = tk.PhotoImage(width=width, height=height)
+        self.create_image(0, 0, anchor="nw", image=self._img)
+        
+        segment_of = [x * self.SEGMENTS // width for x in range(width)]
+        colors = ["#00ff00" if i < 15 else "#ffff00" if i < 18 else "#ff0000"
+                  for i in range(self.SEGMENTS)]
+        
+        # Precompute one image row per number of lit segments (0..20)
+        self._rows = []
+        for active in range(self.SEGMENTS + 1):
+            row = " ".join(colors[seg] if seg < active else self.OFF_COLOR for seg in segment_of)
+            self._rows.append("{" + row + "}")
+        
+        self._last_active = -1
+        self._draw(0)
+    
+    def _draw(self, active_segments: int):
+        """Blit the precomputed row for the given segment count."""
+        # Tk tiles the single row across the whole target rectangle
+        self._img.put(self._rows[active_segments], to=(0, 0, self.width, self.height))
+        self._last_active = active_segments
     
     def update_level(self, level: float):
         """Update the level display."""
         self.level = max(0.0, min(1.0, level))
-        active_segments = int(self.level * 20)
+        active_segments = int(self.level * self.SEGMENTS)
         
-        for i, (seg_id, color) in enumerate(self.segments):
-            if i < active_segments:
-                self.itemconfig(seg_id, fill=color)
-            else:
-                self.itemconfig(seg_id, fill="#222222")
+        if active_segments != self._last_active:
+            self._draw(active_segments)
 
 
 class DnDSpeakerGUI:
@@ -59,6 +71,9 @@ class DnDSpeakerGUI:
         
         # State
         self.is_running = False
+        self._input_device_map: Dict[str, int] = {}
+        self._output_device_map: Dict[str, int] = {}
+        self._level_job: Optional[str] = None
         self.current_voice = config.get("current_voice", "Neutral Narrator")
         
         self._build_ui()
@@ -90,7 +105,7 @@ class DnDSpeakerGUI:
         self.output_combo.bind("<<ComboboxSelected>>", self._on_output_device_change)
         
         # Refresh devices button
-        refresh_btn = ttk.Button(main_frame, text="Refresh Devices", command=self._refresh_devices)
+        refresh_btn = ttk.Button(main_frame, text="Refresh Devices", command=self._on_refresh_devices_click)
         refresh_btn.grid(row=3, column=0, columnspan=2, pady=10)
         
         # Separator
@@ -179,13 +194,18 @@ class DnDSpeakerGUI:
         """Refresh the device lists."""
         # Input devices
         input_devices = self.audio_engine.get_input_devices()
-        input_names = [f"{name} ({idx})" for idx, name in input_devices]
-        self.input_combo['values'] = input_names
+        self._input_device_map = {f"{name} ({idx})": idx for idx, name in input_devices}
+        self.input_combo['values'] = list(self._input_device_map)
         
         # Output devices
         output_devices = self.audio_engine.get_output_devices()
-        output_names = [f"{name} ({idx})" for idx, name in output_devices]
-        self.output_combo['values'] = output_names
+        self._output_device_map = {f"{name} ({idx})": idx for idx, name in output_devices}
+        self.output_combo['values'] = list(self._output_device_map)
+    
+    def _on_refresh_devices_click(self):
+        """Handle refresh devices button click."""
+        self.audio_engine.invalidate_devices()
+        self._refresh_devices()
     
     def _load_settings(self):
         """Load settings from config."""
@@ -196,18 +216,16 @@ class DnDSpeakerGUI:
         output_idx = self.config.get("output_device")
         
         if input_idx is not None:
-            input_devices = self.audio_engine.get_input_devices()
-            for idx, name in input_devices:
+            for label, idx in self._input_device_map.items():
                 if idx == input_idx:
-                    self.input_var.set(f"{name} ({idx})")
+                    self.input_var.set(label)
                     self.audio_engine.set_input_device(idx)
                     break
         
         if output_idx is not None:
-            output_devices = self.audio_engine.get_output_devices()
-            for idx, name in output_devices:
+            for label, idx in self._output_device_map.items():
                 if idx == output_idx:
-                    self.output_var.set(f"{name} ({idx})")
+                    self.output_var.set(label)
                     self.audio_engine.set_output_device(idx)
                     break
         
@@ -216,12 +234,9 @@ class DnDSpeakerGUI:
     
     def _on_input_device_change(self, event=None):
         """Handle input device change."""
-        selection = self.input_var.get()
-        if selection:
-            # Extract device index from "(name) (idx)" format
+        idx = self._input_device_map.get(self.input_var.get())
+        if idx is not None:
             try:
-                idx_str = selection.split("(")[-1].rstrip(")")
-                idx = int(idx_str)
                 self.audio_engine.set_input_device(idx)
                 self.config.set("input_device", idx)
             except Exception:
@@ -229,11 +244,9 @@ class DnDSpeakerGUI:
     
     def _on_output_device_change(self, event=None):
         """Handle output device change."""
-        selection = self.output_var.get()
-        if selection:
+        idx = self._output_device_map.get(self.output_var.get())
+        if idx is not None:
             try:
-                idx_str = selection.split("(")[-1].rstrip(")")
-                idx = int(idx_str)
                 self.audio_engine.set_output_device(idx)
                 self.config.set("output_device", idx)
             except Exception:
@@ -275,6 +288,7 @@ class DnDSpeakerGUI:
                 self.audio_engine.start()
                 self.is_running = True
                 self.start_stop_btn.config(text="Stop")
+                self._start_level_monitor()
                 if self.on_start_stop:
                     self.on_start_stop(True)
             except Exception as e:
@@ -284,6 +298,7 @@ class DnDSpeakerGUI:
             self.audio_engine.stop()
             self.is_running = False
             self.start_stop_btn.config(text="Start")
+            self._stop_level_monitor()
             if self.on_start_stop:
                 self.on_start_stop(False)
     
@@ -296,20 +311,34 @@ class DnDSpeakerGUI:
             self.on_bypass_toggle(bypass)
     
     def _start_level_monitor(self):
-        """Start monitoring audio levels."""
+        """Start monitoring audio levels (only polls while audio is running)."""
+        if self._level_job is not None:
+            return
+        
         def update_levels():
-            if self.is_running:
-                input_level = self.audio_engine.get_input_level()
-                output_level = self.audio_engine.get_output_level()
-                
-                self.input_meter.update_level(input_level)
-                self.output_meter.update_level(output_level)
+            if not self.is_running:
+                self._level_job = None
+                return
             
-            # Schedule next update
-            self.root.after(50, update_levels)
+            input_level = self.audio_engine.get_input_level()
+            output_level = self.audio_engine.get_output_level()
+            
+            self.input_meter.update_level(input_level)
+            self.output_meter.update_level(output_level)
+            
+            # Schedule next update (~30 fps)
+            self._level_job = self.root.after(33, update_levels)
         
         update_levels()
     
+    def _stop_level_monitor(self):
+        """Stop monitoring audio levels and clear the meters."""
+        if self._level_job is not None:
+            self.root.after_cancel(self._level_job)
+            self._level_job = None
+        self.input_meter.update_level(0.0)
+        self.output_meter.update_level(0.0)
+    
     def set_voice_from_hotkey(self, voice: str):
         """Set voice from hotkey (called externally)."""
         if voice in self.voice_buttons:
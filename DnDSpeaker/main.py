@@ -4,11 +4,15 @@ import signal
 import keyboard  # type: ignore
 import numpy as np
 from audio_engine import AudioEngine
+from async_processor import AsyncProcessor
 from voice_processor import VoiceProcessor
-from voice_presets import get_preset, list_presets
+from voice_presets import get_preset, PRESET_NAME_SET
 from config import Config
 from gui import DnDSpeakerGUI
 
+# Keys that turn a bare hotkey press into a different combination
+MODIFIER_KEYS = ('ctrl', 'alt', 'shift', 'windows')
+
 
 class DnDSpeakerApp:
     """Main application controller."""
@@ -19,6 +23,9 @@ class DnDSpeakerApp:
         # Initialize audio components
         self.sample_rate = 44100
         self.chunk_size = 1024
+        # Chunks per block on the processing thread: the effect chain runs
+        # half as often, for one extra chunk of latency
+        self.block_chunks = 2
         
         self.audio_engine = AudioEngine(
             sample_rate=self.sample_rate,
@@ -27,7 +34,16 @@ class DnDSpeakerApp:
         
         self.voice_processor = VoiceProcessor(
             sample_rate=self.sample_rate,
-            chunk_size=self.chunk_size
+            chunk_size=self.chunk_size * self.block_chunks
+        )
+        
+        # Run the effect chain on a worker thread; the audio callback only
+        # exchanges chunks with it
+        self.async_processor = AsyncProcessor(
+            self.voice_processor.process,
+            sample_rate=self.sample_rate,
+            chunk_size=self.chunk_size,
+            block_chunks=self.block_chunks
         )
         
         # Set up processing callback
@@ -49,6 +65,7 @@ class DnDSpeakerApp:
         
         # Set up GUI callbacks
         self.gui.on_voice_change = self._on_voice_change
+        self.gui.on_start_stop = self._on_start_stop
         
         # Set up hotkeys
         self._setup_hotkeys()
@@ -58,8 +75,15 @@ class DnDSpeakerApp:
         signal.signal(signal.SIGTERM, self._signal_handler)
     
     def _process_audio(self, audio: np.ndarray) -> np.ndarray:
-        """Process audio chunk."""
-        return self.voice_processor.process(audio)
+        """Process audio chunk (called on the audio thread)."""
+        return self.async_processor.process(audio)
+    
+    def _on_start_stop(self, running: bool):
+        """Start or stop the processing worker along with audio."""
+        if running:
+            self.async_processor.start()
+        else:
+            self.async_processor.stop()
     
     def _on_voice_change(self, voice: str):
         """Handle voice change from GUI."""
@@ -70,17 +94,39 @@ class DnDSpeakerApp:
         """Set up keyboard hotkeys."""
         hotkeys = self.config.get("hotkeys", {})
         
+        # Single keys are dispatched from one global hook; only combinations
+        # like "ctrl+1" need a hotkey of their own
+        self._hotkey_map = {}
         for key, voice in hotkeys.items():
             try:
                 # Register hotkey
-                keyboard.add_hotkey(key, lambda v=voice: self._switch_voice(v))
+                if "+" in key:
+                    keyboard.add_hotkey(key, lambda v=voice: self._switch_voice(v))
+                else:
+                    self._hotkey_map[key.lower()] = voice
                 print(f"Registered hotkey: {key} -> {voice}")
             except Exception as e:
                 print(f"Failed to register hotkey {key}: {e}")
+        
+        if self._hotkey_map:
+            try:
+                keyboard.on_press(self._dispatch_hotkey)
+            except Exception as e:
+                print(f"Failed to register hotkeys: {e}")
+    
+    def _dispatch_hotkey(self, event):
+        """Switch voice if the pressed key is a hotkey."""
+        # Like add_hotkey, a bare key doesn't match while a modifier is held,
+        # so e.g. Ctrl+1 in another app or a "ctrl+1" hotkey leaves "1" alone
+        if any(keyboard.is_pressed(m) for m in MODIFIER_KEYS):
+            return
+        voice = self._hotkey_map.get(event.name)
+        if voice is not None:
+            self._switch_voice(voice)
     
     def _switch_voice(self, voice: str):
         """Switch voice from hotkey."""
-        if voice in list_presets():
+        if voice in PRESET_NAME_SET:
             self.gui.set_voice_from_hotkey(voice)
             print(f"Switched to: {voice}")
     
@@ -96,6 +142,8 @@ class DnDSpeakerApp:
             keyboard.unhook_all()
         except Exception:
             pass
+        self.config.flush()
+        self.async_processor.stop()
         self.audio_engine.cleanup()
         self.gui.cleanup()
     
@@ -0,0 +1,86 @@
+"""Lock-free ring buffer for passing audio chunks between threads."""
+import numpy as np
+from typing import Optional
+
+
+class SPSCRingBuffer:
+    """Single-producer/single-consumer ring of preallocated float32 chunks.
+
+    No locks are needed as long as exactly one thread pushes and one thread
+    pops: the head index is only written by the producer and the tail index
+    only by the consumer, and int attribute stores are atomic in CPython.
+
+    Overflow never raises. A push into a full ring is discarded, and once the
+    consumer falls more than max_backlog chunks behind, peek() skips ahead
+    and drops the oldest chunks so latency stays bounded.
+    """
+
+    def __init__(self, num_slots: int, chunk_size: int, max_backlog: Optional[int] = None):
+        self.num_slots = num_slots
+        self.chunk_size = chunk_size
+        self.max_backlog = max_backlog if max_backlog is not None else max(1, num_slots // 2)
+        self.slots = np.zeros((num_slots, chunk_size), dtype=np.float32)
+        self.lengths = [0] * num_slots
+
+        self._head = 0  # Next slot to write (producer only)
+        self._tail = 0  # Next slot to read (consumer only)
+
+        # Drop counters, each written by one side only
+        self._rejected = 0  # Pushes discarded because the ring was full
+        self._skipped = 0  # Stale chunks skipped by the consumer
+
+    def __len__(self) -> int:
+        return self._head - self._tail
+
+    @property
+    def dropped(self) -> int:
+        """Total number of chunks lost to overflow."""
+        return self._rejected + self._skipped
+
+    def push(self, chunk: np.ndarray) -> bool:
+        """Copy a chunk into the ring. Returns False if the ring is full."""
+        head = self._head
+        if head - self._tail >= self.num_slots:
+            self._rejected += 1
+            return False
+
+        slot = head % self.num_slots
+        n = min(len(chunk), self.chunk_size)
+        np.copyto(self.slots[slot, :n], chunk[:n], casting='same_kind')
+        self.lengths[slot] = n
+
+        # Publish only after the slot is fully written
+        self._head = head + 1
+        return True
+
+    def peek(self) -> Optional[np.ndarray]:
+        """Return a view of the oldest chunk, or None if the ring is empty.
+
+        The view stays valid until advance() is called.
+        """
+        tail = self._tail
+        head = self._head
+        if tail == head:
+            return None
+
+        # Drop the oldest chunks if we've fallen too far behind
+        backlog = head - tail
+        if backlog > self.max_backlog:
+            self._skipped += backlog - self.max_backlog
+            tail = head - self.max_backlog
+            self._tail = tail
+
+        slot = tail % self.num_slots
+        return self.slots[slot, :self.lengths[slot]]
+
+    def advance(self):
+        """Release the chunk returned by peek()."""
+        if self._tail != self._head:
+            self._tail += 1
+
+    def clear(self):
+        """Discard all chunks. Only safe while neither side is running."""
+        self._head = 0
+        self._tail = 0
+        self._rejected = 0
+        self._skipped = 0
@@ -1,13 +1,148 @@
 """Real-time voice transformation processor."""
 import numpy as np
 from scipy import signal  # type: ignore
-from typing import Optional, Dict, Any
-import collections
+from scipy import fft as scipy_fft  # type: ignore
+from typing import Dict, Optional, Tuple
+from fractions import Fraction
+import math
+from voice_presets import VoicePreset
+
+# Numba is optional: effects fall back to vectorized NumPy without it
+try:
+    from numba import njit  # type: ignore
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# pyFFTW is optional: when present this module's transforms use cached FFTW
+# plans. Only calls through _fft use it; scipy.fft's global backend is left alone
+try:
+    import pyfftw  # type: ignore
+    import pyfftw.interfaces.scipy_fft  # type: ignore
+    pyfftw.interfaces.cache.enable()
+    _fft = pyfftw.interfaces.scipy_fft
+    PYFFTW_AVAILABLE = True
+except ImportError:
+    _fft = scipy_fft
+    PYFFTW_AVAILABLE = False
+
+# Bits of VoiceProcessor._stages: pipeline stages the current preset enables
+_STAGE_SPEED = 1 << 0
+_STAGE_PITCH = 1 << 1
+_STAGE_FORMANT = 1 << 2
+_STAGE_RESONANCE = 1 << 3
+_STAGE_DISTORTION = 1 << 4
+_STAGE_RING_MOD = 1 << 5
+_STAGE_PHASER = 1 << 6
+_STAGE_TREMOLO = 1 << 7
+_STAGE_REVERB = 1 << 8
+_STAGE_CLEAN_BOOST = 1 << 9
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _biquad_df2t(x, out, b0, b1, b2, a1, a2, state):
+        """Run a biquad in transposed direct form II, carrying state across calls."""
+        s1 = state[0]
+        s2 = state[1]
+        for i in range(x.shape[0]):
+            xi = x[i]
+            y = b0 * xi + s1
+            s1 = b1 * xi - a1 * y + s2
+            s2 = b2 * xi - a2 * y
+            out[i] = y
+        state[0] = s1
+        state[1] = s2
+    
+    @njit(cache=True, fastmath=True)
+    def _effects_kernel(audio, out,
+                        resonance, resonance_delay,
+                        distortion,
+                        ring_mod, ring_dz,
+                        phaser, phaser_line, phaser_pos, phaser_delay,
+                        tremolo, tremolo_z, tremolo_dz,
+                        reverb, reverb_line, reverb_pos, reverb_delay,
+                        clean_boost):
+        """Run resonance through clean boost and clipping in a single pass.
+        
+        Matches the per-stage methods sample for sample. The ring modulator
+        and tremolo oscillators are unit phasors rotated by *_dz every sample,
+        so their sine is z.imag without calling sin(). Returns the new reverb
+        and phaser write positions.
+        """
+        n = audio.shape[0]
+        drive = 1.0 + distortion * 2.0
+        phaser_size = phaser_line.shape[0]
+        use_phaser = phaser > 0 and 0 < phaser_delay < phaser_size
+        reverb_size = reverb_line.shape[0]
+        ring_z = 1.0 + 0.0j  # Carrier restarts at phase 0 every chunk
+        
+        for i in range(n):
+            x = audio[i]
+            
+            # Resonance: comb against the stage input
+            if resonance > 0 and i >= resonance_delay:
+                x += audio[i - resonance_delay] * resonance
+            
+            # Distortion: soft clipping blended with the dry signal
+            if distortion > 0:
+                x = (1.0 - distortion) * x + distortion * math.tanh(x * drive)
+            
+            # Ring modulation
+            if ring_mod > 0:
+                x = (1.0 - ring_mod) * x + ring_mod * x * ring_z.imag
+                ring_z *= ring_dz
+            
+            # Phaser: mix in the stage input from phaser_delay samples ago
+            if phaser > 0:
+                delayed = phaser_line[(phaser_pos - phaser_delay) % phaser_size]
+                phaser_line[phaser_pos] = x
+                phaser_pos = (phaser_pos + 1) % phaser_size
+                if use_phaser:
+                    x += phaser * 0.5 * delayed
+            
+            # Tremolo
+            if tremolo > 0:
+                x *= 1.0 + tremolo * tremolo_z.imag
+                tremolo_z *= tremolo_dz
+            
+            # Reverb: feedback comb with dry/wet mix
+            if reverb > 0:
+                y = x + reverb_line[(reverb_pos - reverb_delay) % reverb_size] * reverb * 0.5
+                reverb_line[reverb_pos] = y * 0.7
+                reverb_pos = (reverb_pos + 1) % reverb_size
+                x = (1.0 - reverb * 0.3) * x + reverb * 0.3 * y
+            
+            x *= clean_boost
+            out[i] = min(max(x, -1.0), 1.0)
+        
+        return reverb_pos, phaser_pos
+
+
+def _ring_read(ring: np.ndarray, start: int, out: np.ndarray):
+    """Copy len(out) samples out of a circular buffer, starting at start."""
+    size = len(ring)
+    start %= size
+    first = min(len(out), size - start)
+    out[:first] = ring[start:start + first]
+    out[first:] = ring[:len(out) - first]
+
+
+def _ring_write(ring: np.ndarray, start: int, data: np.ndarray):
+    """Copy data into a circular buffer, starting at start."""
+    size = len(ring)
+    start %= size
+    first = min(len(data), size - start)
+    ring[start:start + first] = data[:first]
+    ring[:len(data) - first] = data[first:]
 
 
 class VoiceProcessor:
     """Processes audio in real-time to transform voice characteristics."""
     
+    RING_MOD_FREQ = 200.0  # Hz
+    TREMOLO_RATE = 5.0  # Hz
+    
     def __init__(self, sample_rate: int = 44100, chunk_size: int = 1024):
         self.sample_rate = sample_rate
         self.chunk_size = chunk_size
@@ -17,251 +152,462 @@ class VoiceProcessor:
         self.overlap_buffer = np.zeros(self.buffer_size, dtype=np.float32)
         self.output_buffer = np.zeros(self.buffer_size, dtype=np.float32)
         
-        # Reverb delay line
+        # Reverb delay line (circular buffer of past outputs)
         self.reverb_buffer_size = int(sample_rate * 0.1)  # 100ms delay
-        self.reverb_buffer = collections.deque(maxlen=self.reverb_buffer_size)
-        for _ in range(self.reverb_buffer_size):
-            self.reverb_buffer.append(0.0)
+        self.reverb_delay = int(sample_rate * 0.05)  # 50ms echo tap
+        self.reverb_buffer = np.zeros(self.reverb_buffer_size, dtype=np.float32)
         self.reverb_pos = 0
         
-        # Phaser state
-        self.phaser_buffer = collections.deque(maxlen=int(sample_rate * 0.05))
-        for _ in range(int(sample_rate * 0.05)):
-            self.phaser_buffer.append(0.0)
+        # Phaser state (circular buffer of past phaser inputs)
+        self.phaser_buffer = np.zeros(int(sample_rate * 0.05), dtype=np.float32)
+        self.phaser_pos = 0
         self.phaser_lfo = 0.0
         
         # Tremolo state
         self.tremolo_phase = 0.0
         
-        # Current preset
-        self.current_preset: Optional[Dict[str, Any]] = None
-        
-        # Design filters once (will be updated when preset changes)
-        self.low_cut_filter = None
-        self.high_cut_filter = None
+        # Per-sample oscillator rotations for the fused kernel
+        self._ring_dz = complex(np.exp(2j * np.pi * self.RING_MOD_FREQ / sample_rate))
+        self._tremolo_dz = complex(np.exp(2j * np.pi * self.TREMOLO_RATE / sample_rate))
+        
+        # One chunk of oscillator samples for the NumPy path, cached per length
+        self._osc_len = 0
+        self._ring_carrier: Optional[np.ndarray] = None
+        self._tremolo_sin: Optional[np.ndarray] = None
+        self._tremolo_cos: Optional[np.ndarray] = None
+        
+        # Scratch for the first pitch-shift pass (shifts up to 2x)
+        self._resample_scratch = np.empty(chunk_size * 2, dtype=np.float32)
+        
+        # Polyphase resampling factors and filters, cached per (in, out) length
+        self._resamplers: Dict[Tuple[int, int], tuple] = {}
+        
+        # Stage buffers: each stage writes into the one the previous stage
+        # didn't, so the pipeline runs without per-chunk allocations
+        self._scratch = (np.empty(self.buffer_size, dtype=np.float32),
+                         np.empty(self.buffer_size, dtype=np.float32))
+        self._scratch_index = 0
+        self._output = np.zeros(chunk_size, dtype=np.float32)
+        
+        # Input normalization, cached for the last non-float32 input dtype
+        self._input_dtype: Optional[np.dtype] = None
+        self._input_scale = np.float32(1.0)
+        
+        # Formant shift interpolation map, cached per (length, shift)
+        self._formant_key: Optional[tuple] = None
+        self._formant_idx: Optional[np.ndarray] = None
+        self._formant_frac: Optional[np.ndarray] = None
+        
+        # Current preset, plus its parameters decoded for the audio path
+        self.current_preset: Optional[VoicePreset] = None
+        self._stages = 0
+        self._speed = 1.0
+        self._pitch_shift_amount = 1.0
+        self._formant_shift_amount = 1.0
+        self._resonance = 0.0
+        self._distortion = 0.0
+        self._ring_mod = 0.0
+        self._phaser = 0.0
+        self._tremolo = 0.0
+        self._reverb = 0.0
+        self._clean_boost = 1.0
+        
+        # Design filters once (will be updated when preset changes). The cut
+        # filters are (sos, zi) pairs, swapped in whole by set_preset so the
+        # processing thread never sees new coefficients with the old state
+        self.low_cut: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self.high_cut: Optional[Tuple[np.ndarray, np.ndarray]] = None
         self.low_boost_filter = None
         self.high_boost_filter = None
+        self.low_boost_state = np.zeros(2)
+        self.high_boost_state = np.zeros(2)
         
-    def set_preset(self, preset: Dict[str, Any]):
+        if NUMBA_AVAILABLE:
+            self._warm_up_kernels()
+    
+    def _warm_up_kernels(self):
+        """Compile the effect kernels now so the first audio chunk doesn't wait on JIT."""
+        line = np.zeros(32, dtype=np.float32)
+        out = np.empty(16, dtype=np.float32)
+        # Every stage keeps audio in float32, so one specialization each is enough
+        dummy = np.zeros(16, dtype=np.float32)
+        _biquad_df2t(dummy, out, 1.0, 0.0, 0.0, 0.0, 0.0, np.zeros(2))
+        _effects_kernel(dummy, out, 0.1, 4, 0.1, 0.1, self._ring_dz, 0.1, line, 0, 4,
+                        0.1, 1.0 + 0.0j, self._tremolo_dz, 0.1, line, 0, 8, 1.0)
+    
+    def set_preset(self, preset: VoicePreset):
         """Set the current voice preset."""
         self.current_preset = preset
+        self._decode_preset()
         self._update_filters()
     
+    def _decode_preset(self):
+        """Unpack the preset into numeric attributes and the enabled-stage bitmask."""
+        preset = self.current_preset or VoicePreset()
+        self._speed = float(preset.speed)
+        self._pitch_shift_amount = float(preset.pitch_shift)
+        self._formant_shift_amount = float(preset.formant_shift)
+        self._resonance = float(preset.resonance)
+        self._distortion = float(preset.distortion)
+        self._ring_mod = float(preset.ring_mod)
+        self._phaser = float(preset.phaser)
+        self._tremolo = float(preset.tremolo)
+        self._reverb = float(preset.reverb)
+        self._clean_boost = float(preset.clean_boost)
+        
+        stages = 0
+        if self._speed != 1.0:
+            stages |= _STAGE_SPEED
+        if self._pitch_shift_amount != 1.0:
+            stages |= _STAGE_PITCH
+        if self._formant_shift_amount != 1.0:
+            stages |= _STAGE_FORMANT
+        if self._resonance > 0:
+            stages |= _STAGE_RESONANCE
+        if self._distortion > 0:
+            stages |= _STAGE_DISTORTION
+        if self._ring_mod > 0:
+            stages |= _STAGE_RING_MOD
+        if self._phaser > 0:
+            stages |= _STAGE_PHASER
+        if self._tremolo > 0:
+            stages |= _STAGE_TREMOLO
+        if self._reverb > 0:
+            stages |= _STAGE_REVERB
+        if self._clean_boost != 1.0:
+            stages |= _STAGE_CLEAN_BOOST
+        self._stages = stages
+    
     def _update_filters(self):
         """Update filter coefficients based on current preset."""
         if not self.current_preset:
             return
         
         # Low cut filter
-        low_cut = self.current_preset.get("low_cut")
+        low_cut = self.current_preset.low_cut
         if low_cut:
             nyquist = self.sample_rate / 2
             low_cut_norm = low_cut / nyquist
-            self.low_cut_filter = signal.butter(2, low_cut_norm, btype='high', output='sos')
+            sos = signal.butter(2, low_cut_norm, btype='high', output='sos')
+            # float32 coefficients keep sosfilt from upcasting the audio
+            self.low_cut = (sos.astype(np.float32), np.zeros((sos.shape[0], 2), dtype=np.float32))
         else:
-            self.low_cut_filter = None
+            self.low_cut = None
         
         # High cut filter
-        high_cut = self.current_preset.get("high_cut")
+        high_cut = self.current_preset.high_cut
         if high_cut:
             nyquist = self.sample_rate / 2
             high_cut_norm = high_cut / nyquist
-            self.high_cut_filter = signal.butter(2, high_cut_norm, btype='low', output='sos')
+            sos = signal.butter(2, high_cut_norm, btype='low', output='sos')
+            self.high_cut = (sos.astype(np.float32), np.zeros((sos.shape[0], 2), dtype=np.float32))
         else:
-            self.high_cut_filter = None
+            self.high_cut = None
         
         # Low boost (shelving filter)
-        low_boost = self.current_preset.get("low_boost", 1.0)
+        low_boost = self.current_preset.low_boost
         if low_boost != 1.0:
-            # Simple low shelf using IIR
-            freq = 200
-            nyquist = self.sample_rate / 2
-            freq_norm = freq / nyquist
-            # Use a simple approach with biquad
-            self.low_boost_filter = {"gain": low_boost, "freq": freq_norm}
+            self.low_boost_filter = self._design_shelf(low_boost, 200, "low")
         else:
             self.low_boost_filter = None
+        self.low_boost_state = np.zeros(2)
         
         # High boost
-        high_boost = self.current_preset.get("high_boost", 1.0)
+        high_boost = self.current_preset.high_boost
         if high_boost != 1.0:
-            freq = 3000
-            nyquist = self.sample_rate / 2
-            freq_norm = freq / nyquist
-            self.high_boost_filter = {"gain": high_boost, "freq": freq_norm}
+            self.high_boost_filter = self._design_shelf(high_boost, 3000, "high")
         else:
             self.high_boost_filter = None
+        self.high_boost_state = np.zeros(2)
+    
+    def _design_shelf(self, gain: float, freq: float, shelf_type: str) -> tuple:
+        """Design an RBJ cookbook shelving biquad (slope 1).
+        
+        gain is the linear amplitude gain of the shelf. Returns normalized
+        coefficients (b0, b1, b2, a1, a2).
+        """
+        A = np.sqrt(gain)
+        w0 = 2 * np.pi * freq / self.sample_rate
+        cos_w0 = np.cos(w0)
+        alpha = np.sin(w0) / 2 * np.sqrt(2)
+        sqrt_a = 2 * np.sqrt(A) * alpha
+        
+        if shelf_type == "low":
+            b0 = A * ((A + 1) - (A - 1) * cos_w0 + sqrt_a)
+            b1 = 2 * A * ((A - 1) - (A + 1) * cos_w0)
+            b2 = A * ((A + 1) - (A - 1) * cos_w0 - sqrt_a)
+            a0 = (A + 1) + (A - 1) * cos_w0 + sqrt_a
+            a1 = -2 * ((A - 1) + (A + 1) * cos_w0)
+            a2 = (A + 1) + (A - 1) * cos_w0 - sqrt_a
+        else:  # high
+            b0 = A * ((A + 1) + (A - 1) * cos_w0 + sqrt_a)
+            b1 = -2 * A * ((A - 1) + (A + 1) * cos_w0)
+            b2 = A * ((A + 1) + (A - 1) * cos_w0 - sqrt_a)
+            a0 = (A + 1) - (A - 1) * cos_w0 + sqrt_a
+            a1 = 2 * ((A - 1) - (A + 1) * cos_w0)
+            a2 = (A + 1) - (A - 1) * cos_w0 - sqrt_a
+        
+        return (float(b0 / a0), float(b1 / a0), float(b2 / a0), float(a1 / a0), float(a2 / a0))
     
     def process(self, audio_chunk: np.ndarray) -> np.ndarray:
-        """Process an audio chunk and return transformed audio."""
+        """Process an audio chunk and return transformed audio.
+        
+        The returned array is reused by the next call, so copy it out
+        before processing another chunk.
+        """
         if self.current_preset is None:
             return audio_chunk
         
-        # Normalize to [-1, 1] range based on input dtype
-        if audio_chunk.dtype == np.int16:
-            audio_chunk = audio_chunk.astype(np.float32) / 32768.0
-        elif audio_chunk.dtype == np.int32:
-            audio_chunk = audio_chunk.astype(np.float32) / 2147483648.0
-        elif audio_chunk.dtype != np.float32:
-            # For other types, convert to float32 (assume already normalized)
-            audio_chunk = audio_chunk.astype(np.float32)
+        # Normalize to [-1, 1] range based on input dtype; float32 input is
+        # used as is, since no stage modifies its input in place
+        if audio_chunk.dtype != np.float32:
+            if audio_chunk.dtype != self._input_dtype:
+                self._input_dtype = audio_chunk.dtype
+                self._input_scale = self._scale_for_dtype(audio_chunk.dtype)
+            audio_chunk = np.multiply(audio_chunk, self._input_scale,
+                                      out=self._next_buffer(len(audio_chunk)), dtype=np.float32)
         
-        # Apply processing pipeline
-        processed = audio_chunk.copy()
+        # Apply processing pipeline (stages never modify their input in place)
+        processed = audio_chunk
+        stages = self._stages
         
         # 1. Speed adjustment (resample)
-        speed = self.current_preset.get("speed", 1.0)
-        if speed != 1.0:
+        if stages & _STAGE_SPEED:
+            num_samples = int(len(processed) / self._speed)
+        else:
             num_samples = len(processed)
-            indices = np.linspace(0, num_samples - 1, int(num_samples / speed))
-            processed = np.interp(indices, np.arange(num_samples), processed)
         
         # 2. Pitch shifting (using PSOLA-like approach)
-        pitch_shift = self.current_preset.get("pitch_shift", 1.0)
-        if pitch_shift != 1.0:
-            processed = self._pitch_shift(processed, pitch_shift)
+        if stages & _STAGE_PITCH:
+            # The speed change folds into the pitch shift's first resample
+            processed = self._pitch_shift(processed, self._pitch_shift_amount, num_samples)
+        elif stages & _STAGE_SPEED:
+            processed = self._resample(processed, num_samples)
         
         # 3. Formant shifting (spectral envelope manipulation)
-        formant_shift = self.current_preset.get("formant_shift", 1.0)
-        if formant_shift != 1.0:
-            processed = self._formant_shift(processed, formant_shift)
+        if stages & _STAGE_FORMANT:
+            processed = self._formant_shift(processed, self._formant_shift_amount)
         
-        # 4. Apply filters
-        if self.low_cut_filter is not None:
-            processed = signal.sosfilt(self.low_cut_filter, processed)
+        # 4. Apply filters; each pair is read once and its state updated in place
+        low_cut = self.low_cut
+        if low_cut is not None:
+            sos, zi = low_cut
+            processed, zi[...] = signal.sosfilt(sos, processed, zi=zi)
         
-        if self.high_cut_filter is not None:
-            processed = signal.sosfilt(self.high_cut_filter, processed)
+        high_cut = self.high_cut
+        if high_cut is not None:
+            sos, zi = high_cut
+            processed, zi[...] = signal.sosfilt(sos, processed, zi=zi)
         
         if self.low_boost_filter is not None:
-            processed = self._apply_shelving_filter(processed, self.low_boost_filter, "low")
+            processed = self._apply_shelving_filter(processed, self.low_boost_filter, self.low_boost_state)
         
         if self.high_boost_filter is not None:
-            processed = self._apply_shelving_filter(processed, self.high_boost_filter, "high")
-        
-        # 5. Resonance (comb filter)
-        resonance = self.current_preset.get("resonance", 0.0)
-        if resonance > 0:
-            processed = self._apply_resonance(processed, resonance)
-        
-        # 6. Distortion
-        distortion = self.current_preset.get("distortion", 0.0)
-        if distortion > 0:
-            processed = self._apply_distortion(processed, distortion)
-        
-        # 7. Ring modulation (for Warforged)
-        ring_mod = self.current_preset.get("ring_mod", 0.0)
-        if ring_mod > 0:
-            processed = self._apply_ring_modulation(processed, ring_mod)
-        
-        # 8. Phaser (for Lich)
-        phaser = self.current_preset.get("phaser", 0.0)
-        if phaser > 0:
-            processed = self._apply_phaser(processed, phaser)
-        
-        # 9. Tremolo (for Lich)
-        tremolo = self.current_preset.get("tremolo", 0.0)
-        if tremolo > 0:
-            processed = self._apply_tremolo(processed, tremolo)
-        
-        # 10. Reverb
-        reverb = self.current_preset.get("reverb", 0.0)
-        if reverb > 0:
-            processed = self._apply_reverb(processed, reverb)
-        
-        # 11. Clean boost (for Neutral)
-        clean_boost = self.current_preset.get("clean_boost", 1.0)
-        if clean_boost != 1.0:
-            processed = processed * clean_boost
-        
-        # Ensure output is correct length
-        if len(processed) > self.chunk_size:
-            processed = processed[:self.chunk_size]
-        elif len(processed) < self.chunk_size:
-            # Pad with zeros if needed
-            padded = np.zeros(self.chunk_size, dtype=np.float32)
-            padded[:len(processed)] = processed
-            processed = padded
-        
-        # Prevent clipping
-        processed = np.clip(processed, -1.0, 1.0)
-        
-        return processed
+            processed = self._apply_shelving_filter(processed, self.high_boost_filter, self.high_boost_state)
+        
+        if NUMBA_AVAILABLE:
+            # 5-11 and clipping fused into one pass over the buffer
+            processed = self._apply_effects_fused(
+                processed, self._resonance, self._distortion, self._ring_mod, self._phaser,
+                self._tremolo, self._reverb, self._clean_boost
+            )
+        else:
+            # 5. Resonance (comb filter)
+            if stages & _STAGE_RESONANCE:
+                processed = self._apply_resonance(processed, self._resonance)
+            
+            # 6. Distortion
+            if stages & _STAGE_DISTORTION:
+                processed = self._apply_distortion(processed, self._distortion)
+            
+            # 7. Ring modulation (for Warforged)
+            if stages & _STAGE_RING_MOD:
+                processed = self._apply_ring_modulation(processed, self._ring_mod)
+            
+            # 8. Phaser (for Lich)
+            if stages & _STAGE_PHASER:
+                processed = self._apply_phaser(processed, self._phaser)
+            
+            # 9. Tremolo (for Lich)
+            if stages & _STAGE_TREMOLO:
+                processed = self._apply_tremolo(processed, self._tremolo)
+            
+            # 10. Reverb
+            if stages & _STAGE_REVERB:
+                processed = self._apply_reverb(processed, self._reverb)
+            
+            # 11. Clean boost (for Neutral)
+            out = self._next_buffer(len(processed))
+            if stages & _STAGE_CLEAN_BOOST:
+                processed = np.multiply(processed, self._clean_boost, out=out, casting='same_kind')
+            
+            # Prevent clipping
+            processed = np.clip(processed, -1.0, 1.0, out=out, casting='same_kind')
+        
+        # Ensure output is correct length, padding with zeros if needed
+        n = min(len(processed), self.chunk_size)
+        output = self._output
+        output[:n] = processed[:n]
+        output[n:] = 0.0
+        
+        return output
+    
+    @staticmethod
+    def _scale_for_dtype(dtype: np.dtype) -> np.float32:
+        """Factor that maps samples of the given dtype to [-1, 1]."""
+        if dtype == np.int16:
+            return np.float32(1 / 32768.0)
+        if dtype == np.int32:
+            return np.float32(1 / 2147483648.0)
+        # For other types, convert to float32 (assume already normalized)
+        return np.float32(1.0)
     
-    def _pitch_shift(self, audio: np.ndarray, shift: float) -> np.ndarray:
-        """Simple pitch shifting using resampling."""
+    def _next_buffer(self, n: int) -> np.ndarray:
+        """Return n samples of the stage buffer the previous stage didn't write to."""
+        self._scratch_index ^= 1
+        buf = self._scratch[self._scratch_index]
+        return buf[:n] if n <= len(buf) else np.empty(n, dtype=np.float32)
+    
+    def _pitch_shift(self, audio: np.ndarray, shift: float,
+                     num_samples: Optional[int] = None) -> np.ndarray:
+        """Simple pitch shifting using resampling.
+        
+        The result has num_samples samples (default: len(audio)), so a speed
+        change can be applied in the same pass.
+        """
+        if num_samples is None:
+            num_samples = len(audio)
+        
         # For real-time, use a simple resampling approach
         # More sophisticated methods would use phase vocoder, but this is faster
-        indices = np.linspace(0, len(audio) - 1, int(len(audio) * shift))
-        shifted = np.interp(indices, np.arange(len(audio)), audio)
-        
-        # Resample back to original length
-        if len(shifted) != len(audio):
-            indices_back = np.linspace(0, len(shifted) - 1, len(audio))
-            shifted = np.interp(indices_back, np.arange(len(shifted)), shifted)
+        num_shifted = int(num_samples * shift)
+        scratch = self._resample_scratch
+        out = scratch[:num_shifted] if num_shifted <= len(scratch) else None
+        shifted = self._resample(audio, num_shifted, out)
+        
+        # Resample back to the target length
+        if len(shifted) != num_samples:
+            shifted = self._resample(shifted, num_samples)
+        elif shifted.base is scratch:
+            out = self._next_buffer(len(shifted))
+            out[:] = shifted
+            shifted = out
         
         return shifted
     
+    def _resampler(self, n_in: int, n_out: int) -> tuple:
+        """Polyphase up/down factors and anti-aliasing FIR taking n_in to n_out samples."""
+        key = (n_in, n_out)
+        plan = self._resamplers.get(key)
+        if plan is None:
+            ratio = Fraction(n_out, n_in).limit_denominator(64)
+            up, down = ratio.numerator, ratio.denominator
+            
+            # Same filter resample_poly would design, but only once per ratio
+            max_rate = max(up, down)
+            fir = signal.firwin(20 * max_rate + 1, 1.0 / max_rate, window=('kaiser', 5.0))
+            plan = (up, down, fir.astype(np.float32))
+            self._resamplers[key] = plan
+        return plan
+    
+    def _resample(self, audio: np.ndarray, num_samples: int,
+                  out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Resample audio to num_samples points with a polyphase FIR."""
+        if out is None:
+            out = self._next_buffer(num_samples)
+        
+        up, down, fir = self._resampler(len(audio), num_samples)
+        if up == down:
+            resampled = audio
+        else:
+            # Edge padding keeps the filter from ringing against zeros at chunk edges
+            resampled = signal.resample_poly(audio, up, down, window=fir, padtype='edge')
+        
+        # The rational ratio can land a sample off; trim or hold the last sample
+        n = min(len(resampled), num_samples)
+        out[:n] = resampled[:n]
+        out[n:] = resampled[n - 1] if n else 0.0
+        return out
+    
+    def _formant_map(self, n: int, shift: float):
+        """Bin indices and weights that resample an n-point spectrum by shift."""
+        key = (n, shift)
+        if self._formant_key != key:
+            # Shift formants by scaling the (uniform) frequency axis, clamped
+            # to Nyquist; equivalent to np.interp over rfftfreq bins
+            num_bins = n // 2 + 1
+            bin_hz = self.sample_rate / n
+            new_freqs = np.clip(np.arange(num_bins) * bin_hz * shift, 0, self.sample_rate / 2)
+            pos = np.minimum(new_freqs / bin_hz, num_bins - 1)
+            idx = np.minimum(pos.astype(np.intp), max(num_bins - 2, 0))
+            self._formant_idx = idx
+            self._formant_frac = (pos - idx).astype(np.float32)
+            self._formant_key = key
+        return self._formant_idx, self._formant_frac
+    
     def _formant_shift(self, audio: np.ndarray, shift: float) -> np.ndarray:
         """Formant shifting using spectral envelope manipulation."""
         # Use FFT-based approach for formant shifting
-        fft = np.fft.rfft(audio)
-        freqs = np.fft.rfftfreq(len(audio), 1.0 / self.sample_rate)
-        
-        # Shift formants by scaling frequency axis
-        new_freqs = freqs * shift
-        new_freqs = np.clip(new_freqs, 0, self.sample_rate / 2)
+        fft = _fft.rfft(audio)
+        idx, frac = self._formant_map(len(audio), shift)
         
         # Interpolate magnitude and phase
         magnitude = np.abs(fft)
         phase = np.angle(fft)
         
-        # Simple interpolation (could be improved)
-        new_magnitude = np.interp(new_freqs, freqs, magnitude)
-        new_phase = np.interp(new_freqs, freqs, phase)
+        # Simple linear interpolation between neighbouring bins
+        new_magnitude = magnitude[idx] * (1 - frac) + magnitude[idx + 1] * frac
+        new_phase = phase[idx] * (1 - frac) + phase[idx + 1] * frac
         
         # Reconstruct
         new_fft = new_magnitude * np.exp(1j * new_phase)
-        shifted = np.fft.irfft(new_fft, len(audio))
+        shifted = _fft.irfft(new_fft, len(audio))
         
         return shifted.astype(np.float32)
     
-    def _apply_shelving_filter(self, audio: np.ndarray, filter_params: Dict, shelf_type: str) -> np.ndarray:
-        """Apply a shelving filter (simplified)."""
-        gain = filter_params["gain"]
-        freq_norm = filter_params["freq"]
-        
-        # Simple IIR shelving filter approximation
-        # This is a simplified version - a full implementation would use proper biquad
-        if shelf_type == "low":
-            # Boost/cut low frequencies
-            # Simple approach: apply gain to frequencies below cutoff
-            fft = np.fft.rfft(audio)
-            freqs = np.fft.rfftfreq(len(audio), 1.0 / self.sample_rate)
-            cutoff = freq_norm * self.sample_rate / 2
-            
-            mask = freqs < cutoff
-            fft[mask] *= gain
-            
-            filtered = np.fft.irfft(fft, len(audio))
-        else:  # high
-            fft = np.fft.rfft(audio)
-            freqs = np.fft.rfftfreq(len(audio), 1.0 / self.sample_rate)
-            cutoff = freq_norm * self.sample_rate / 2
-            
-            mask = freqs > cutoff
-            fft[mask] *= gain
-            
-            filtered = np.fft.irfft(fft, len(audio))
-        
+    def _apply_shelving_filter(self, audio: np.ndarray, coeffs: tuple, state: np.ndarray) -> np.ndarray:
+        """Apply a shelving biquad, updating its state in place."""
+        b0, b1, b2, a1, a2 = coeffs
+        if NUMBA_AVAILABLE:
+            out = self._next_buffer(len(audio))
+            _biquad_df2t(audio, out, b0, b1, b2, a1, a2, state)
+            return out
+        
+        filtered, state[:] = signal.lfilter((b0, b1, b2), (1.0, a1, a2), audio, zi=state)
         return filtered.astype(np.float32)
     
+    def _apply_effects_fused(self, audio: np.ndarray, resonance: float, distortion: float,
+                             ring_mod: float, phaser: float, tremolo: float, reverb: float,
+                             clean_boost: float) -> np.ndarray:
+        """Apply steps 5-11 plus clipping with the fused Numba kernel."""
+        n = len(audio)
+        out = self._next_buffer(n)
+        
+        # Advance per-chunk modulation state exactly as the individual stages do
+        phaser_delay = self._advance_phaser(n) if phaser > 0 else 0
+        if tremolo > 0:
+            self._advance_tremolo(n)
+        
+        self.reverb_pos, self.phaser_pos = _effects_kernel(
+            audio, out,
+            resonance, self._resonance_delay(),
+            distortion,
+            ring_mod, self._ring_dz,
+            phaser, self.phaser_buffer, self.phaser_pos, phaser_delay,
+            tremolo, complex(math.cos(self.tremolo_phase), math.sin(self.tremolo_phase)), self._tremolo_dz,
+            reverb, self.reverb_buffer, self.reverb_pos, self.reverb_delay,
+            clean_boost,
+        )
+        return out
+    
+    def _resonance_delay(self) -> int:
+        """Comb filter delay for the resonance stage, in samples."""
+        return max(1, int(self.sample_rate * 0.01))  # 10ms delay
+    
     def _apply_resonance(self, audio: np.ndarray, resonance: float) -> np.ndarray:
         """Apply resonance using a comb filter."""
         # Simple comb filter for resonance
-        delay_samples = int(self.sample_rate * 0.01)  # 10ms delay
-        if delay_samples < 1:
-            delay_samples = 1
+        delay_samples = self._resonance_delay()
         
         # Use a simple delay line
         delayed = np.zeros_like(audio)
@@ -278,12 +624,21 @@ class VoiceProcessor:
         distorted = np.tanh(audio * (1.0 + amount * 2.0))
         return (1.0 - amount) * audio + amount * distorted
     
+    def _oscillator_tables(self, n: int):
+        """Build the per-chunk ring mod and tremolo tables for chunks of n samples."""
+        if n != self._osc_len:
+            t = np.arange(n) / self.sample_rate
+            self._ring_carrier = np.sin(2 * np.pi * self.RING_MOD_FREQ * t).astype(np.float32)
+            tremolo_angle = 2 * np.pi * self.TREMOLO_RATE * t
+            self._tremolo_sin = np.sin(tremolo_angle).astype(np.float32)
+            self._tremolo_cos = np.cos(tremolo_angle).astype(np.float32)
+            self._osc_len = n
+    
     def _apply_ring_modulation(self, audio: np.ndarray, amount: float) -> np.ndarray:
         """Apply ring modulation for metallic effect."""
-        # Generate carrier frequency
-        carrier_freq = 200  # Hz
-        t = np.arange(len(audio)) / self.sample_rate
-        carrier = np.sin(2 * np.pi * carrier_freq * t)
+        # The carrier restarts every chunk, so one table serves every chunk
+        self._oscillator_tables(len(audio))
+        carrier = self._ring_carrier
         
         # Ring modulation: multiply signal with carrier
         modulated = audio * carrier
@@ -291,53 +646,82 @@ class VoiceProcessor:
         # Mix with original
         return (1.0 - amount) * audio + amount * modulated
     
-    def _apply_phaser(self, audio: np.ndarray, amount: float) -> np.ndarray:
-        """Apply phaser effect."""
-        # Simple phaser using all-pass filter approximation
-        # Update LFO
+    def _advance_phaser(self, num_samples: int) -> int:
+        """Advance the phaser LFO by one chunk and return its delay in samples."""
         lfo_rate = 0.5  # Hz
-        self.phaser_lfo += 2 * np.pi * lfo_rate / self.sample_rate * len(audio)
-        if self.phaser_lfo > 2 * np.pi:
-            self.phaser_lfo -= 2 * np.pi
+        # fmod wraps without a branch, however large the step
+        self.phaser_lfo = math.fmod(
+            self.phaser_lfo + 2 * math.pi * lfo_rate / self.sample_rate * num_samples, 2 * math.pi
+        )
         
         # Modulate delay
-        delay = 0.005 + 0.003 * np.sin(self.phaser_lfo)  # 5-8ms delay
-        delay_samples = int(delay * self.sample_rate)
-        
-        # Simple all-pass approximation
-        if delay_samples > 0 and delay_samples < len(audio):
-            phased = audio.copy()
-            phased[delay_samples:] += audio[:-delay_samples] * 0.5
+        delay = 0.005 + 0.003 * math.sin(self.phaser_lfo)  # 5-8ms delay
+        return int(delay * self.sample_rate)
+    
+    def _apply_phaser(self, audio: np.ndarray, amount: float) -> np.ndarray:
+        """Apply phaser effect."""
+        # Simple phaser using all-pass filter approximation
+        delay_samples = self._advance_phaser(len(audio))
+        n = len(audio)
+        size = len(self.phaser_buffer)
+        
+        # Input from delay_samples ago, reaching back into previous chunks
+        delayed = None
+        if 0 < delay_samples < size:
+            delayed = np.empty(n, dtype=np.float32)
+            head = min(delay_samples, n)
+            _ring_read(self.phaser_buffer, self.phaser_pos - delay_samples, delayed[:head])
+            delayed[head:] = audio[:n - head]
+        
+        # Remember this chunk's input for the next one
+        keep = min(n, size)
+        _ring_write(self.phaser_buffer, self.phaser_pos + n - keep, audio[n - keep:])
+        self.phaser_pos = (self.phaser_pos + n) % size
+        
+        if delayed is not None:
+            phased = audio + delayed * 0.5
             return (1.0 - amount) * audio + amount * phased
         
         return audio
     
+    def _advance_tremolo(self, num_samples: int):
+        """Advance the tremolo phase by one chunk."""
+        self.tremolo_phase = math.fmod(
+            self.tremolo_phase + 2 * math.pi * self.TREMOLO_RATE / self.sample_rate * num_samples,
+            2 * math.pi
+        )
+    
     def _apply_tremolo(self, audio: np.ndarray, amount: float) -> np.ndarray:
         """Apply tremolo (amplitude modulation)."""
-        tremolo_rate = 5.0  # Hz
-        t = np.arange(len(audio)) / self.sample_rate
-        self.tremolo_phase += 2 * np.pi * tremolo_rate / self.sample_rate * len(audio)
-        if self.tremolo_phase > 2 * np.pi:
-            self.tremolo_phase -= 2 * np.pi
-        
-        modulation = 1.0 + amount * np.sin(2 * np.pi * tremolo_rate * t + self.tremolo_phase)
-        return audio * modulation
+        self._advance_tremolo(len(audio))
+        self._oscillator_tables(len(audio))
+        
+        # sin(wt + phase) from the cached sin(wt)/cos(wt) tables
+        phase = self.tremolo_phase
+        lfo = self._tremolo_sin * np.float32(math.cos(phase)) + self._tremolo_cos * np.float32(math.sin(phase))
+        return audio * (1.0 + amount * lfo)
     
     def _apply_reverb(self, audio: np.ndarray, amount: float) -> np.ndarray:
         """Apply simple reverb using delay line."""
-        reverb_out = np.zeros_like(audio)
-        
-        for i, sample in enumerate(audio):
-            # Get delayed sample
-            delay_pos = (self.reverb_pos - int(self.sample_rate * 0.05)) % self.reverb_buffer_size
-            delayed = self.reverb_buffer[delay_pos]
+        reverb_out = np.empty(len(audio), dtype=np.float32)
+        delay = self.reverb_delay
+        size = self.reverb_buffer_size
+        
+        # Feedback comb: out[n] = in[n] + amount * 0.5 * line[n - delay], with
+        # line[n] = 0.7 * out[n]. Each output only depends on samples at least
+        # `delay` back, so blocks of up to `delay` samples vectorize exactly.
+        start = 0
+        while start < len(audio):
+            block = min(delay, len(audio) - start)
+            out = reverb_out[start:start + block]
             
-            # Mix with current sample
-            reverb_out[i] = sample + delayed * amount * 0.5
+            _ring_read(self.reverb_buffer, self.reverb_pos - delay, out)
+            out *= amount * 0.5
+            out += audio[start:start + block]
             
-            # Update delay line
-            self.reverb_buffer[self.reverb_pos] = reverb_out[i] * 0.7
-            self.reverb_pos = (self.reverb_pos + 1) % self.reverb_buffer_size
+            _ring_write(self.reverb_buffer, self.reverb_pos, out * 0.7)
+            self.reverb_pos = (self.reverb_pos + block) % size
+            start += block
         
         # Mix reverb with dry signal
         return (1.0 - amount * 0.3) * audio + amount * 0.3 * reverb_out
@@ -6,7 +6,9 @@ Shows how the observer would work in real-time monitoring mode.
 
 import sys
 import os
+import heapq
 import time
+from collections import Counter
 from pathlib import Path
 
 # Add the current directory to Python path
@@ -14,6 +16,8 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from grim_observer import GrimObserver
 
+# Most player names listed in the summary
+MAX_PLAYERS_SHOWN = 50
 
 def demo_observer():
     """Demonstrate the observer functionality."""
@@ -33,24 +37,36 @@ def demo_observer():
     output_file = Path(__file__).parent / "demo_events.json"
     
     try:
-        # Create observer instance
+        # Create observer instance; only the summary counters below and the
+        # events waiting to be written are kept in memory
         observer = GrimObserver(
             log_file_path=str(sample_log_path),
             output_file=str(output_file),
-            verbose=True
+            verbose=True,
+            stream_events=True,
+            buffer_output=True
         )
         
+        event_types = Counter()
+        players = set()
+        
+        def count_event(event):
+            event_types[event.event_type] += 1
+            if event.player_name:
+                players.add(event.player_name)
+        
+        observer.on_event = count_event
+        
         print("Starting log processing...")
         print("-" * 50)
         
-        # Process the entire file (simulating real-time monitoring)
-        with open(sample_log_path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line_num, line in enumerate(f, 1):
-                observer.process_line(line)
-                
-                # Show progress every 500 lines
-                if line_num % 500 == 0:
-                    print(f"Processed {line_num} lines...")
+        # Process the entire file (simulating real-time monitoring) in one
+        # call; matching lines are located by C-level searches, not a Python loop
+        observer.process_file(sample_log_path)
+        print(f"Processed {observer.lines_processed} lines...")
+        
+        # Write the buffered events in one go
+        observer.flush(output_file)
         
         print("-" * 50)
         print("Log processing completed!")
@@ -58,22 +74,18 @@ def demo_observer():
         
         # Show results
         print("Results:")
-        print(f"Total events detected: {len(observer.events)}")
+        total_events = sum(event_types.values())
+        print(f"Total events detected: {total_events}")
         
-        if observer.events:
+        if total_events:
             print("\nEvent Summary:")
-            event_types = {}
-            players = set()
-            
-            for event in observer.events:
-                event_types[event.event_type] = event_types.get(event.event_type, 0) + 1
-                if event.player_name:
-                    players.add(event.player_name)
-            
             for event_type, count in event_types.items():
                 print(f"  {event_type}: {count}")
             
-            print(f"\nPlayers involved: {', '.join(sorted(players))}")
+            shown = heapq.nsmallest(MAX_PLAYERS_SHOWN, players)
+            more = len(players) - len(shown)
+            suffix = f" (+{more} more)" if more else ""
+            print(f"\nPlayers involved: {', '.join(shown)}{suffix}")
             
             # Show current player count
             current_count = observer.get_player_count()
@@ -86,10 +98,11 @@ def demo_observer():
                 for event in recent[-3:]:  # Show last 3 events
                     print(f"  {event}")
         
-        # Show output file info
-        if output_file.exists():
+        # Show output file info; the observer counts what it wrote, so the
+        # file needn't be stat'ed
+        if observer.output_bytes:
             print(f"\nEvents saved to: {output_file}")
-            print(f"File size: {output_file.stat().st_size} bytes")
+            print(f"File size: {observer.output_bytes} bytes")
         
         print("\nDemo completed successfully!")
         
@@ -16,13 +16,19 @@ Version: 1.0.0
 from __future__ import annotations
 
 import argparse
+import http.client
 import json
+import mmap
 import os
+import queue
 import re
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Union
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 from datetime import datetime, timezone
 import logging
@@ -32,13 +38,31 @@ import random # Added for peak milestone messages
 __version__ = "1.0.0"
 __version_date__ = "2025-08-09"
 
+# Buffered events are written once this many are waiting
+OUTPUT_BATCH_SIZE = 1000
+
+# Seconds of events kept for get_recent_events() lookups
+RECENT_EVENT_WINDOW = 10 * 60
+
+# Discord accepts about this many webhook messages per period (seconds)
+WEBHOOK_RATE_LIMIT = 30
+WEBHOOK_RATE_PERIOD = 60.0
+
+# Seconds to wait on one webhook request before giving up on it
+WEBHOOK_TIMEOUT = 10
+
+# Monitor-mode webhooks waiting to be sent; further ones are dropped
+WEBHOOK_QUEUE_SIZE = 1024
+
+# Seconds to let queued webhooks go out when monitoring stops
+WEBHOOK_SHUTDOWN_TIMEOUT = 10.0
+
 # Try to import requests, fall back to urllib if not available
 try:
     import requests
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
-    import urllib.request
     import urllib.parse
 
 # Log library availability
@@ -48,10 +72,39 @@ else:
     print("[GrimObserver][WARN] requests library not available, falling back to urllib")
     print("[GrimObserver][INFO] Install requests with: pip install requests")
 
+# Try to import orjson for faster JSON encoding, fall back to json if not available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Try to import inotify_simple (Linux) so monitoring can wait for log writes
+# instead of polling, fall back to polling if not available
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+    INOTIFY_AVAILABLE = True
+except ImportError:
+    INOTIFY_AVAILABLE = False
+
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    """Encode obj as compact (or 2-space indented) JSON bytes, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
 
 class LogEvent:
     """Represents a parsed log event."""
     
+    # A whole-log scan can create many events; slots keep each one small
+    __slots__ = ('timestamp', 'event_type', 'player_name', 'ip_address', 'player_id',
+                 'raw_line', '_parsed_time')
+    
     def __init__(self, timestamp: str, event_type: str, player_name: str = None, 
                  ip_address: str = None, player_id: str = None, raw_line: str = ""):
         self.timestamp = timestamp
@@ -60,7 +113,14 @@ class LogEvent:
         self.ip_address = ip_address
         self.player_id = player_id
         self.raw_line = raw_line
-        self.parsed_at = datetime.now(timezone.utc).isoformat()
+        # Formatting the parse time is left until it's read; most events never
+        # have theirs serialized
+        self._parsed_time = time.time()
+    
+    @property
+    def parsed_at(self) -> str:
+        """When the event was parsed, as an ISO 8601 UTC timestamp."""
+        return datetime.fromtimestamp(self._parsed_time, timezone.utc).isoformat()
     
     def to_dict(self) -> Dict:
         """Convert event to dictionary for serialization."""
@@ -78,81 +138,180 @@ class LogEvent:
         return f"[{self.timestamp}] {self.event_type}: {self.player_name or 'N/A'}"
 
 
+def _decode(data: bytes) -> str:
+    """Decode log bytes the same way the log file is read in text mode."""
+    return data.decode('utf-8', 'ignore')
+
+
+# Unix time at the start of each log date seen, keyed by its YYYY.MM.DD text;
+# a log spans few dates, so each one is converted only once
+_DAY_STARTS: Dict[str, float] = {}
+
+
+def _parse_log_time(text: str) -> Optional[float]:
+    """Parse a Conan log timestamp (2025.08.09-22.09.34:324), taken as UTC, to Unix time
+    without strptime.
+    
+    Returns None if the text is in any other format.
+    """
+    if len(text) != 23 or text[4] != '.' or text[10] != '-' or text[19] != ':':
+        return None
+    try:
+        day = text[:10]
+        day_start = _DAY_STARTS.get(day)
+        if day_start is None:
+            day_start = datetime(int(text[0:4]), int(text[5:7]), int(text[8:10]),
+                                 tzinfo=timezone.utc).timestamp()
+            _DAY_STARTS[day] = day_start
+        hours, minutes, seconds, millis = (int(text[11:13]), int(text[14:16]),
+                                           int(text[17:19]), int(text[20:23]))
+    except ValueError:
+        return None
+    if not (0 <= hours < 24 and 0 <= minutes < 60 and 0 <= seconds < 60 and millis >= 0):
+        return None
+    return day_start + hours * 3600 + minutes * 60 + seconds + millis / 1000
+
+
+def _noop(*args, **kwargs):
+    """Stands in for a logging call that verbose mode has turned off."""
+
+
 class ConanLogParser:
     """Parses ConanSandbox log entries for player events."""
     
-    def __init__(self):
-        # Regex patterns for different log entry types
-        self.patterns = {
-            'player_connected': re.compile(
-                r'BattlEyeServer: Print Message: Player #(\d+) (\S+) \((\S+):(\d+)\) connected'
-            ),
-            'player_disconnected_battleye': re.compile(
-                r'BattlEyeServer: Print Message: Player #(\d+) (\S+) disconnected'
-            ),
-            'player_disconnected_lognet': re.compile(
-                r'LogNet: Player disconnected: (\S+)'
-            ),
-            'timestamp': re.compile(r'\[(\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2}:\d{3})\]')
-        }
+    # Literal text that every player event line contains; lines without any of
+    # it are rejected before a regex runs
+    _LOGNET_KEYWORD = 'LogNet: Player disconnected: '
+    _BATTLEYE_KEYWORD = 'BattlEyeServer: Print Message: Player #'
+    _KEYWORDS = (_LOGNET_KEYWORD, _BATTLEYE_KEYWORD)
+    _BYTE_KEYWORDS = tuple(keyword.encode() for keyword in _KEYWORDS)
+    _LOGNET_BYTE_KEYWORD, _BATTLEYE_BYTE_KEYWORD = _BYTE_KEYWORDS
+    
+    # Regex patterns for different log entry types. Every pattern the parser
+    # uses is compiled once, when the class is defined, and shared by all
+    # parsers, so parsing a line never compiles a regex
+    patterns = {
+        # One pass finds the timestamp and whichever player event the line
+        # holds. LogNet disconnects are the most common, so they go first.
+        # Lines start with the timestamp, so this is used with match().
+        'player_event': re.compile(
+            r'\[(?P<timestamp>\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2}:\d{3})\].*?'
+            r'(?:LogNet: Player disconnected: (?P<lognet_name>\S+)'
+            r'|BattlEyeServer: Print Message: Player #(?P<player_id>\d+) (?P<player_name>\S+) '
+            r'(?:\((?P<ip_address>\S+):(?P<port>\d+)\) connected|disconnected))'
+        )
+    }
+    # The same patterns for lines read in binary mode
+    byte_patterns = {
+        name: re.compile(pattern.pattern.encode())
+        for name, pattern in patterns.items()
+    }
+    # The per-line pattern, bound directly so parsing skips the dict lookup
+    _PLAYER_EVENT = patterns['player_event']
+    _BYTE_PLAYER_EVENT = byte_patterns['player_event']
     
     def parse_line(self, line: str) -> Optional[LogEvent]:
         """Parse a single log line and return a LogEvent if it matches known patterns."""
-        if not line.strip():
+        # Two inline checks; any() over the tuple costs a generator per line
+        if self._LOGNET_KEYWORD not in line and self._BATTLEYE_KEYWORD not in line:
             return None
         
-        # Extract timestamp
-        timestamp_match = self.patterns['timestamp'].search(line)
-        if not timestamp_match:
+        match = self._PLAYER_EVENT.match(line)
+        if not match:
             return None
         
-        timestamp = timestamp_match.group(1)
+        timestamp = match.group('timestamp')
         
-        # Check for player connection
-        conn_match = self.patterns['player_connected'].search(line)
-        if conn_match:
-            player_id = conn_match.group(1)
-            player_name = conn_match.group(2)
-            ip_address = conn_match.group(3)
-            return LogEvent(
-                timestamp=timestamp,
-                event_type='player_connected',
-                player_name=player_name,
-                ip_address=ip_address,
-                player_id=player_id,
-                raw_line=line.strip()
-            )
-        
-        # Check for player disconnection (BattlEye)
-        disc_battleye_match = self.patterns['player_disconnected_battleye'].search(line)
-        if disc_battleye_match:
-            player_id = disc_battleye_match.group(1)
-            player_name = disc_battleye_match.group(2)
+        # Check for player disconnection (LogNet)
+        lognet_name = match.group('lognet_name')
+        if lognet_name is not None:
+            # Filter out player names with hash followed by numbers (e.g., Sweetbread#26947);
+            # isdecimal() accepts exactly what \d does in a str pattern
+            head, sep, tag = lognet_name.rpartition('#')
+            if sep and tag.isdecimal():
+                return None
+            
             return LogEvent(
                 timestamp=timestamp,
                 event_type='player_disconnected',
-                player_name=player_name,
-                player_id=player_id,
+                player_name=sys.intern(lognet_name),
                 raw_line=line.strip()
             )
         
-        # Check for player disconnection (LogNet)
-        disc_lognet_match = self.patterns['player_disconnected_lognet'].search(line)
-        if disc_lognet_match:
-            player_name = disc_lognet_match.group(1)
+        # Player connection or disconnection (BattlEye); only connections carry an address
+        ip_address = match.group('ip_address')
+        # The same few hundred names, ids and addresses recur across thousands
+        # of events; interning keeps one copy of each in memory
+        return LogEvent(
+            timestamp=timestamp,
+            event_type='player_connected' if ip_address is not None else 'player_disconnected',
+            player_name=sys.intern(match.group('player_name')),
+            ip_address=sys.intern(ip_address) if ip_address is not None else None,
+            player_id=sys.intern(match.group('player_id')),
+            raw_line=line.strip()
+        )
+    
+    def event_lines(self, buffer) -> Iterator[bytes]:
+        """Yield the lines of a bytes-like buffer (bytes, mmap) that contain a
+        player event keyword, in file order.
+        
+        Keywords are located with the buffer's own find(), a C-level substring
+        search that is far faster than running a regex over every line.
+        """
+        keywords = self._BYTE_KEYWORDS
+        size = len(buffer)
+        positions = [buffer.find(keyword) for keyword in keywords]
+        while True:
+            pos = -1
+            for found in positions:
+                if found != -1 and (pos == -1 or found < pos):
+                    pos = found
+            if pos == -1:
+                return
             
+            start = buffer.rfind(b'\n', 0, pos) + 1
+            end = buffer.find(b'\n', pos)
+            if end == -1:
+                end = size
+            yield buffer[start:end]
+            
+            # Move every keyword past this line so a line is only yielded once
+            for i, found in enumerate(positions):
+                if found != -1 and found < end:
+                    positions[i] = buffer.find(keywords[i], end)
+    
+    def parse_line_bytes(self, line: bytes) -> Optional[LogEvent]:
+        """Parse an undecoded log line; only the fields of a matching line are decoded."""
+        if self._LOGNET_BYTE_KEYWORD not in line and self._BATTLEYE_BYTE_KEYWORD not in line:
+            return None
+        
+        match = self._BYTE_PLAYER_EVENT.match(line)
+        if not match:
+            return None
+        
+        lognet_name = match.group('lognet_name')
+        if lognet_name is not None:
             # Filter out player names with hash followed by numbers (e.g., Sweetbread#26947)
-            if re.search(r'#\d+$', player_name):
+            head, sep, tag = lognet_name.rpartition(b'#')
+            if sep and tag.isdigit():
                 return None
             
             return LogEvent(
-                timestamp=timestamp,
+                timestamp=_decode(match.group('timestamp')),
                 event_type='player_disconnected',
-                player_name=player_name,
-                raw_line=line.strip()
+                player_name=sys.intern(_decode(lognet_name)),
+                raw_line=_decode(line.strip())
             )
         
-        return None
+        ip_address = match.group('ip_address')
+        return LogEvent(
+            timestamp=_decode(match.group('timestamp')),
+            event_type='player_connected' if ip_address is not None else 'player_disconnected',
+            player_name=sys.intern(_decode(match.group('player_name'))),
+            ip_address=sys.intern(_decode(ip_address)) if ip_address is not None else None,
+            player_id=sys.intern(_decode(match.group('player_id'))),
+            raw_line=_decode(line.strip())
+        )
 
 
 class GrimObserver:
@@ -160,7 +319,7 @@ class GrimObserver:
     Main class for monitoring Conan Exiles server logs and sending Discord notifications.
     """
     
-    def __init__(self, log_file_path: str, output_file: str = None, verbose: bool = False, discord_webhook_url: str = None, force_curl: bool = False, map_name: str = None, empty_server_message_interval: int = 4 * 60 * 60, use_rich_embeds: bool = True):
+    def __init__(self, log_file_path: str, output_file: str = None, verbose: bool = False, discord_webhook_url: str = None, force_curl: bool = False, map_name: str = None, empty_server_message_interval: int = 4 * 60 * 60, use_rich_embeds: bool = True, stream_events: bool = False, buffer_output: bool = False, max_events: Optional[int] = None):
         """
         Initialize Grim Observer with log file path and optional Discord webhook.
         
@@ -173,6 +332,12 @@ class GrimObserver:
             map_name: Map name for map-specific configurations
             empty_server_message_interval: Interval in seconds for empty server messages (default: 4 hours)
             use_rich_embeds: Enable rich embeds for empty server messages (default: True)
+            stream_events: Don't retain every event in memory; keep only player state
+                and the most recent events (default: False)
+            buffer_output: Hold events for the output file until flush() instead of
+                writing each one as it arrives (default: False)
+            max_events: Keep at most this many events in self.events, dropping the
+                oldest (default: None, no limit)
         """
         # ============================================================================
         # 🖼️ CUSTOM IMAGE CONFIGURATION
@@ -220,6 +385,24 @@ class GrimObserver:
         # Initialize state
         self.events = []
         self.players_online = set()
+        # Each player's most recent connection event, kept alongside players_online
+        self.last_connections: Dict[str, LogEvent] = {}
+        # Without streaming, players_online is replayed from self.events on
+        # demand; these record which list it reflects and how far into it
+        self._counted_events: List[LogEvent] = self.events
+        self._counted = 0
+        self.stream_events = stream_events
+        self.buffer_output = buffer_output
+        self.max_events = max_events
+        # Events waiting to be written by flush() when output is buffered
+        self.unsaved_events: List[LogEvent] = []
+        self.output_bytes = 0  # Bytes written by flush() so far
+        # In streaming mode only a bounded window of events is kept for lookups
+        self.recent_events: Deque[LogEvent] = deque(maxlen=256)
+        # (unix time, event) pairs from the last RECENT_EVENT_WINDOW seconds, when streaming
+        self._recent: Deque[Tuple[float, LogEvent]] = deque()
+        # Called with each new event, e.g. to aggregate statistics while streaming
+        self.on_event: Optional[Callable[[LogEvent], None]] = None
         self.peak_players = 0
         self.peak_timestamp = None
         self.milestone_thresholds = [5, 10, 25, 50, 100]
@@ -229,6 +412,14 @@ class GrimObserver:
         self.last_message_type = None  # Track last message type for variety
         self.running = False
         self.use_rich_embeds = use_rich_embeds
+        # Webhook connections, opened on first use and kept alive between sends
+        self._http_session = None
+        self._https_connection = None
+        # Thread that sends monitor-mode webhooks from a bounded queue, started on first use
+        self._webhook_sender: Optional[threading.Thread] = None
+        self._webhook_queue: Optional[queue.Queue] = None
+        # Times of the latest batch sends, for staying under Discord's rate limit
+        self._webhook_send_times: Deque[float] = deque(maxlen=WEBHOOK_RATE_LIMIT)
         
         # ============================================================================
         # 🖼️ UPDATE THESE URLs WITH YOUR CUSTOM IMAGES
@@ -424,18 +615,32 @@ class GrimObserver:
         
         # Setup logging
         self.logger = logging.getLogger(__name__)
+        # Per-event logging; skipped entirely, formatting included, unless verbose
+        self._log = self.logger.info if self.verbose else _noop
         
         # Create map-specific log file if no output file specified
         if not self.output_file:
             map_suffix = f".{self.map_name}" if self.map_name else ".unknown"
             self.output_file = Path(f"grim_events{map_suffix}.json")
         
+        # There is always an output file by now, so pick how events reach it
+        # once rather than per event
+        self._save_output = self._buffer_event if self.buffer_output else self.save_event
+        
         # Setup logging with map-specific log file
         self._setup_logging()
         
         # Initialize parser and state
         self.parser = ConanLogParser()
         self.current_position = 0
+        self.lines_processed = 0
+        # Log file kept open between reads, the file it was opened as, and
+        # the position it was left at
+        self._log_fh = None
+        self._log_fh_id = None
+        self._log_fh_position = None
+        # Output file kept open by save_event() between events
+        self._output_fh = None
         
         # Log version information
         self.logger.info(f"Grim Observer v{self.version} ({self.version_date}) initialized")
@@ -485,85 +690,301 @@ class GrimObserver:
         except OSError:
             return 0
     
-    def read_new_lines(self) -> List[str]:
-        """Read new lines from the log file since last check."""
+    def read_new_lines(self) -> List[bytes]:
+        """Read new complete lines from the log file since last check, undecoded.
+        
+        A line still being written is left in the file until its newline arrives.
+        """
         try:
             # Check if the log_file_path is actually a file
             if not os.path.isfile(self.log_file_path):
                 self.logger.warning(f"Log file path is not a file: {self.log_file_path}")
                 return []
                 
-            with open(self.log_file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            f = self._open_log_file()
+            # The handle is usually still where the last read left it
+            if self._log_fh_position != self.current_position:
                 f.seek(self.current_position)
-                new_lines = f.readlines()
-                self.current_position = f.tell()
-                return new_lines
+            data = f.read()
+            self._log_fh_position = f.tell()
+            
+            # Only lines that are complete count as read; the rest is read again
+            # next time, once the server has finished writing it
+            end = data.rfind(b'\n') + 1
+            self.current_position += end
+            new_lines = data[:end].split(b'\n')
+            new_lines.pop()  # Empty piece after the last newline
+            
+            # On Windows an open handle stops the server from rotating its log
+            if os.name == 'nt':
+                self._close_log_file()
+            return new_lines
         except Exception as e:
             self.logger.error(f"Error reading log file: {e}")
+            self._close_log_file()
             return []
     
+    def _open_log_file(self):
+        """Return the open log file, reopening it if the path now names a different file."""
+        st = os.stat(self.log_file_path)
+        file_id = (self.log_file_path, st.st_dev, st.st_ino)
+        if self._log_fh is None or self._log_fh_id != file_id:
+            self._close_log_file()
+            self._log_fh = open(self.log_file_path, 'rb', buffering=65536)
+            self._log_fh_id = file_id
+        return self._log_fh
+    
+    def _close_log_file(self):
+        """Close the log file handle kept by read_new_lines()."""
+        if self._log_fh is not None:
+            self._log_fh.close()
+        self._log_fh = None
+        self._log_fh_id = None
+        self._log_fh_position = None
+    
     def process_line(self, line: str):
         """Process a single log line."""
         event = self.parser.parse_line(line)
         if event:
+            self._handle_event(event)
+    
+    def process_line_bytes(self, line: bytes):
+        """Process a single log line read in binary mode, without decoding it first."""
+        event = self.parser.parse_line_bytes(line)
+        if event:
+            self._handle_event(event)
+    
+    def process_file(self, path: Union[str, Path] = None) -> int:
+        """Process a whole log file in one pass and return the number of events found.
+        
+        Sets lines_processed to the number of lines in the file.
+        """
+        found = 0
+        for event in self._scan_file(path or self.log_file_path):
+            self._handle_event(event)
+            found += 1
+        return found
+    
+    def _scan_file(self, path: Union[str, Path]) -> Iterator[LogEvent]:
+        """Yield the player events in a log file, scanning it as one memory-mapped buffer.
+        
+        Substring searches over the buffer find the lines that can hold a player
+        event; only those are parsed. Sets lines_processed once exhausted.
+        """
+        self.lines_processed = 0
+        
+        # mmap rejects empty files
+        if os.path.getsize(path) == 0:
+            return
+        
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # The file is read once front to back; let the kernel read ahead
+            # aggressively (the hints don't exist on Windows)
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            
+            parse = self.parser.parse_line_bytes
+            for line in self.parser.event_lines(mm):
+                event = parse(line)
+                if event:
+                    yield event
+            
+            # Count lines a slice at a time so the file is never copied whole
+            lines = 0
+            for start in range(0, len(mm), 1 << 20):
+                lines += mm[start:start + (1 << 20)].count(b'\n')
+            if mm[-1:] != b'\n':
+                lines += 1  # Last line has no newline
+            self.lines_processed = lines
+    
+    def _handle_event(self, event: LogEvent):
+        """Record a parsed event, notify Discord, and save it to the output file."""
+        if self.stream_events:
+            self._track_event(event)
+        else:
             self.events.append(event)
-            self.logger.info(f"Event detected: {event}")
+            if self.max_events and len(self.events) > self.max_events:
+                self._trim_events()
+        if self.on_event:
+            self.on_event(event)
+        self._log("Event detected: %s", event)
+        
+        # Send Discord webhook for new events if webhook URL is available
+        if self.discord_webhook_url and event.event_type in ['player_connected', 'player_disconnected']:
+            # Generate and send Discord webhook for this single event
+            payloads = self.generate_discord_webhook_payloads([event])
             
-            # Send Discord webhook for new events if webhook URL is available
-            if self.discord_webhook_url and event.event_type in ['player_connected', 'player_disconnected']:
-                # Generate and send Discord webhook for this single event
-                payloads = self.generate_discord_webhook_payloads([event])
-                
-                if payloads:
-                    success = self.send_discord_webhook(payloads[0])
-                    if success:
-                        self.logger.info(f"Discord webhook sent successfully for {event.event_type}")
-                    else:
-                        self.logger.error(f"Failed to send Discord webhook for {event.event_type}")
-                else:
-                    self.logger.warning(f"No payloads generated for event: {event.event_type}")
-                
-                # Check for peak milestones after player connections
-                if event.event_type == 'player_connected' and self.discord_webhook_url:
-                    current_players = self.get_player_count()
-                    peak_message = self._check_peak_milestone(current_players)
-                    if peak_message:
-                        self.logger.info(f"Peak milestone reached: {current_players} players")
-                        success = self.send_discord_webhook(peak_message)
-                        if success:
-                            self.logger.info(f"Peak milestone message sent successfully")
-                        else:
-                            self.logger.error(f"Failed to send peak milestone message")
-                
-                # Check if server went empty after disconnections
-                elif event.event_type == 'player_disconnected' and self.discord_webhook_url:
-                    current_players = self.get_player_count()
-                    if current_players == 0:
-                        self._reset_peak_tracking()
-                        empty_message = self._check_empty_server_message(current_players)
-                        if empty_message:
-                            self.logger.info(f"Empty server message sent: {current_players} players")
-                            success = self.send_discord_webhook(empty_message)
-                            if success:
-                                self.logger.info(f"Empty server message sent successfully")
-                            else:
-                                self.logger.error(f"Failed to send empty server message")
+            if payloads:
+                self._queue_webhook(payloads[0], f"Discord webhook for {event.event_type}")
             else:
-                # Discord webhook conditions not met - no logging needed
-                pass
+                self.logger.warning("No payloads generated for event: %s", event.event_type)
             
-            # Save to output file if specified
-            if self.output_file:
-                self.save_event(event)
+            # Check for peak milestones after player connections
+            if event.event_type == 'player_connected' and self.discord_webhook_url:
+                current_players = self.get_player_count()
+                peak_message = self._check_peak_milestone(current_players)
+                if peak_message:
+                    self.logger.info("Peak milestone reached: %s players", current_players)
+                    self._queue_webhook(peak_message, "peak milestone message")
+            
+            # Check if server went empty after disconnections
+            elif event.event_type == 'player_disconnected' and self.discord_webhook_url:
+                current_players = self.get_player_count()
+                if current_players == 0:
+                    self._reset_peak_tracking()
+                    empty_message = self._check_empty_server_message(current_players)
+                    if empty_message:
+                        self.logger.info("Empty server message sent: %s players", current_players)
+                        self._queue_webhook(empty_message, "empty server message")
+        else:
+            # Discord webhook conditions not met - no logging needed
+            pass
+        
+        # Save to output file
+        self._save_output(event)
+    
+    def _queue_webhook(self, payload: Dict, description: str):
+        """Hand a webhook to the sender thread so reading the log never waits on Discord."""
+        if self._webhook_sender is None:
+            # One thread, so messages arrive in the order their events happened
+            self._webhook_queue = queue.Queue(maxsize=WEBHOOK_QUEUE_SIZE)
+            self._webhook_sender = threading.Thread(
+                target=self._send_queued_webhooks, name="webhook-sender", daemon=True)
+            self._webhook_sender.start()
+        try:
+            self._webhook_queue.put_nowait((payload, description))
+        except queue.Full:
+            self.logger.warning("Webhook queue full, dropping %s", description)
+    
+    def _send_queued_webhooks(self):
+        """Send queued webhooks until the None that marks the end of the queue."""
+        webhooks = self._webhook_queue
+        while True:
+            item = webhooks.get()
+            if item is None:
+                return
+            self._deliver_webhook(*item)
+    
+    def _deliver_webhook(self, payload: Dict, description: str):
+        """Send a queued webhook within the rate limit and log how it went."""
+        if self._send_discord_webhook_paced(payload):
+            self.logger.info("Sent %s", description)
+        else:
+            self.logger.error("Failed to send %s", description)
+    
+    def _close_webhook_sender(self):
+        """Give queued webhooks up to WEBHOOK_SHUTDOWN_TIMEOUT seconds to go out, then stop the sender."""
+        sender = self._webhook_sender
+        if sender is None:
+            return
+        deadline = time.monotonic() + WEBHOOK_SHUTDOWN_TIMEOUT
+        try:
+            self._webhook_queue.put(None, timeout=WEBHOOK_SHUTDOWN_TIMEOUT)
+            ended = 1
+        except queue.Full:
+            ended = 0
+        sender.join(max(deadline - time.monotonic(), 0))
+        if sender.is_alive():
+            # The thread is a daemon, so it won't hold up exit
+            self.logger.warning("Gave up on %s unsent webhooks", self._webhook_queue.qsize() - ended)
+        self._webhook_sender = None
+        self._webhook_queue = None
+    
+    def _trim_events(self):
+        """Drop the oldest events beyond max_events.
+        
+        The list is cut back to three quarters of the limit, so it is trimmed
+        once per batch of new events rather than on every one.
+        """
+        # Bring the player count up to date before the events it replays go
+        self.get_player_count()
+        del self.events[:len(self.events) - self.max_events * 3 // 4]
+        self._counted = len(self.events)
+    
+    def _track_event(self, event: LogEvent):
+        """Update player state and the recent-event window for a streamed event."""
+        self._update_players_online(event)
+        self.recent_events.append(event)
+        self._remember_recent(event)
+    
+    def _update_players_online(self, event: LogEvent):
+        """Add or remove the event's player from the online set."""
+        if event.event_type == 'player_connected':
+            self.players_online.add(event.player_name)
+            self.last_connections[event.player_name] = event
+        elif event.event_type == 'player_disconnected':
+            self.players_online.discard(event.player_name)
+    
+    def _remember_recent(self, event: LogEvent):
+        """Add an event to the time window, dropping events that have aged out of it."""
+        ts = self.parse_timestamp(event.timestamp)
+        recent = self._recent
+        recent.append((ts, event))
+        while recent[0][0] < ts - RECENT_EVENT_WINDOW:
+            recent.popleft()
+    
+    def _event_history(self):
+        """Events available for lookups: all of them, or the recent window when streaming."""
+        return self.recent_events if self.stream_events else self.events
     
     def save_event(self, event: LogEvent):
         """Save event to output file."""
         try:
-            with open(self.output_file, 'a', encoding='utf-8') as f:
-                json.dump(event.to_dict(), f)
-                f.write('\n')
+            f = self._open_output_file()
+            f.write(_dumps(event.to_dict()) + b'\n')
+            # Written through at once, as when the file was reopened per event
+            f.flush()
         except Exception as e:
             self.logger.error(f"Error saving event: {e}")
+            self._close_output_file()
+    
+    def _open_output_file(self):
+        """Return the output file kept open by save_event(), reopening it if output_file changed."""
+        path = str(self.output_file)
+        if self._output_fh is None or self._output_fh.name != path:
+            self._close_output_file()
+            self._output_fh = open(path, 'ab')
+        return self._output_fh
+    
+    def _close_output_file(self):
+        """Close the output file handle kept by save_event()."""
+        if self._output_fh is not None:
+            self._output_fh.close()
+        self._output_fh = None
+    
+    def _buffer_event(self, event: LogEvent):
+        """Hold an event for the output file, flushing once a batch has built up."""
+        self.unsaved_events.append(event)
+        if len(self.unsaved_events) >= OUTPUT_BATCH_SIZE:
+            self.flush()
+    
+    def flush(self, output_file: Union[str, Path] = None) -> int:
+        """Write buffered events to the output file in a single write.
+        
+        Returns the number of bytes written.
+        """
+        written = self.save_events(self.unsaved_events, output_file)
+        if written:
+            self.unsaved_events.clear()
+        return written
+    
+    def save_events(self, events: List[LogEvent], output_file: Union[str, Path] = None) -> int:
+        """Append events to the output file in a single write and return the bytes written."""
+        if not events:
+            return 0
+        
+        data = b''.join(_dumps(event.to_dict()) + b'\n' for event in events)
+        try:
+            with open(output_file or self.output_file, 'ab') as f:
+                f.write(data)
+        except Exception as e:
+            self.logger.error(f"Error saving events: {e}")
+            return 0
+        
+        self.output_bytes += len(data)
+        return len(data)
     
     def scan_entire_log(self) -> List[LogEvent]:
         """Scan the entire log file and return all events."""
@@ -576,22 +997,11 @@ class GrimObserver:
                 self.logger.warning(f"Log file path is not a file: {self.log_file_path}")
                 return []
                 
-            with open(self.log_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                total_lines = 0
-                for line_num, line in enumerate(f, 1):
-                    total_lines += 1
-                    
-                    # Show progress every 1000 lines
-                    if line_num % 1000 == 0:
-                        self.logger.info(f"Processed {line_num} lines...")
-                    
-                    event = self.parser.parse_line(line)
-                    if event:
-                        events.append(event)
-                        if self.verbose:
-                            self.logger.info(f"Line {line_num}: {event}")
+            events = list(self._scan_file(self.log_file_path))
+            for event in events:
+                self._log("Found event: %s", event)
             
-            self.logger.info(f"Scan completed. Total lines: {total_lines}, Events found: {len(events)}")
+            self.logger.info(f"Scan completed. Total lines: {self.lines_processed}, Events found: {len(events)}")
             return events
             
         except Exception as e:
@@ -603,11 +1013,13 @@ class GrimObserver:
         if events is None:
             events = self.events
         
-        payloads = []
-        
+        # No embeds for cleaner look; Discord doesn't need an empty list sent
+        return [{"content": content} for content in self._webhook_contents(events)]
+    
+    def _webhook_contents(self, events: List[LogEvent]) -> Iterator[str]:
+        """Yield the Discord message text for each join/leave event."""
         # Get map name for title (default to "Server" if not specified)
         map_name = self.map_name or "Server"
-        map_emoji = "🌴" if map_name.lower() == "siptah" else "🏔️" if map_name.lower() == "exiled" else "🎮"
         
         for event in events:
             if event.event_type == 'player_connected':
@@ -615,27 +1027,17 @@ class GrimObserver:
                 # The current event is already in self.events, so get_player_count() includes it
                 current_players = self.get_player_count()
                 
-                payload = {
-                    "content": f"🟢 **{event.player_name}** joined {map_name}\n⏰ {event.timestamp} • 👥 Player #{current_players}",
-                    "embeds": []  # No embeds for cleaner look
-                }
-                payloads.append(payload)
+                yield f"🟢 **{event.player_name}** joined {map_name}\n⏰ {event.timestamp} • 👥 Player #{current_players}"
                 
             elif event.event_type == 'player_disconnected':
                 # Calculate session duration if we have connection time
                 session_duration = self._get_session_duration(event.player_name)
                 duration_text = f"⏱️ Session: {session_duration}" if session_duration else ""
                 
-                payload = {
-                    "content": f"🔴 **{event.player_name}** left {map_name}\n⏰ {event.timestamp} • {duration_text}",
-                    "embeds": []  # No embeds for cleaner look
-                }
-                payloads.append(payload)
-        
-        return payloads
+                yield f"🔴 **{event.player_name}** left {map_name}\n⏰ {event.timestamp} • {duration_text}"
     
     def send_discord_webhook(self, payload: Dict) -> bool:
-        """Send a Discord webhook payload using CURL as primary method.
+        """Send a Discord webhook payload, falling back to CURL if Python's HTTP fails.
         
         Args:
             payload: The Discord webhook payload to send
@@ -648,168 +1050,183 @@ class GrimObserver:
             return False
         
         # Log webhook execution
-        self.logger.info(f"Discord webhook execution started")
+        self.logger.info("Discord webhook execution started")
         
         try:
             if self.force_curl:
                 # Force CURL usage only
                 return self._send_with_curl(payload)
             
-            # Try CURL first (since it works manually)
-            if self._send_with_curl(payload):
-                return True
-            
-            # Fallback to Python libraries if CURL fails
-            self.logger.info("CURL method failed, trying Python libraries...")
-            
+            # Python libraries first: they reuse a kept-alive connection, where
+            # CURL starts a process and a TLS handshake for every message
             if REQUESTS_AVAILABLE:
-                return self._send_with_requests(payload)
+                sent = self._send_with_requests(payload)
             else:
-                return self._send_with_urllib(payload)
+                sent = self._send_with_urllib(payload)
+            if sent:
+                return True
+            
+            # Fallback to CURL (which works where Python's SSL setup doesn't)
+            self.logger.info("Python HTTP method failed, trying CURL...")
+            return self._send_with_curl(payload)
                     
         except Exception as e:
-            self.logger.error(f"Error sending Discord webhook: {e}")
-            self.logger.error(f"[DEBUG] Exception type: {type(e).__name__}")
-            self.logger.error(f"[DEBUG] Exception details: {str(e)}")
+            self.logger.error("Error sending Discord webhook: %s", e)
+            self.logger.error("[DEBUG] Exception type: %s", type(e).__name__)
+            self.logger.error("[DEBUG] Exception details: %s", str(e))
             return False
     
     def _send_with_curl(self, payload: Dict) -> bool:
         """Send Discord webhook using CURL command."""
         try:
             import subprocess
-            import tempfile
-            import os
             
-            # Convert payload to JSON string
-            json_data = json.dumps(payload, ensure_ascii=False)
+            # Build CURL command; the JSON is piped to CURL's stdin
+            curl_cmd = [
+                'curl', '-s', '-w', '%{http_code}',  # Silent mode, return HTTP status code
+                '-X', 'POST',
+                '-H', 'Content-Type: application/json',
+                '--data-binary', '@-',  # Read data from stdin
+                self.discord_webhook_url
+            ]
             
-            # Create temporary file for JSON data
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as temp_file:
-                temp_file.write(json_data)
-                temp_file_path = temp_file.name
+            # Execute CURL command
+            result = subprocess.run(curl_cmd, input=_dumps(payload), capture_output=True, timeout=30)
+            stdout = result.stdout.decode('utf-8', errors='replace')
+            stderr = result.stderr.decode('utf-8', errors='replace')
             
-            try:
-                # Build CURL command
-                curl_cmd = [
-                    'curl', '-s', '-w', '%{http_code}',  # Silent mode, return HTTP status code
-                    '-X', 'POST',
-                    '-H', 'Content-Type: application/json',
-                    '-d', f'@{temp_file_path}',  # Read data from file
-                    self.discord_webhook_url
-                ]
-                
-                # Execute CURL command
-                result = subprocess.run(curl_cmd, capture_output=True, text=True, timeout=30)
-                
-                # Clean up temp file
-                os.unlink(temp_file_path)
-                
-                # Parse response
-                if result.returncode == 0:
-                    # CURL succeeded, check HTTP status code
-                    try:
-                        http_status = int(result.stdout.strip())
-                        if http_status == 204:  # Discord returns 204 on success
-                            self.logger.info(f"CURL Discord webhook sent successfully: {payload.get('content', 'No content')}")
-                            return True
-                        else:
-                            self.logger.error(f"CURL Discord webhook failed with status {http_status}")
-                            self.logger.error(f"[DEBUG] CURL stderr: {result.stderr}")
-                            return False
-                    except ValueError:
-                        self.logger.error(f"CURL returned invalid status code: {result.stdout}")
+            # Parse response
+            if result.returncode == 0:
+                # CURL succeeded, check HTTP status code
+                try:
+                    http_status = int(stdout.strip())
+                    if http_status == 204:  # Discord returns 204 on success
+                        self.logger.info("CURL Discord webhook sent successfully: %s", payload.get('content', 'No content'))
+                        return True
+                    else:
+                        self.logger.error("CURL Discord webhook failed with status %s", http_status)
+                        self.logger.error("[DEBUG] CURL stderr: %s", stderr)
                         return False
-                else:
-                    self.logger.error(f"CURL command failed with return code {result.returncode}")
-                    self.logger.error(f"[DEBUG] CURL stderr: {result.stderr}")
+                except ValueError:
+                    self.logger.error("CURL returned invalid status code: %s", stdout)
                     return False
-                    
-            except Exception as e:
-                # Clean up temp file on any error
-                try:
-                    os.unlink(temp_file_path)
-                except:
-                    pass
-                raise e
+            else:
+                self.logger.error("CURL command failed with return code %s", result.returncode)
+                self.logger.error("[DEBUG] CURL stderr: %s", stderr)
+                return False
                 
         except Exception as e:
-            self.logger.error(f"Error in CURL method: {e}")
+            self.logger.error("Error in CURL method: %s", e)
             return False
     
     def _send_with_requests(self, payload: Dict) -> bool:
         """Send Discord webhook using requests library."""
         try:
-            # Convert payload to JSON
-            data = json.dumps(payload)
-            self.logger.info(f"[DEBUG] Requests method: JSON data length: {len(data)} bytes")
-            self.logger.info(f"[DEBUG] Requests method: JSON data (first 200 chars): {data[:200]}")
-            
-            # Send request using requests library
+            # Convert payload to JSON; the encoded body is sent as is
+            data = _dumps(payload)
             headers = {'Content-Type': 'application/json'}
-            self.logger.info(f"[DEBUG] Requests method: Request method: POST")
-            self.logger.info(f"[DEBUG] Requests method: Request headers: {headers}")
-            self.logger.info(f"[DEBUG] Requests method: Request data length: {len(data)}")
+            debug = self.logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                self.logger.debug("Requests method: JSON data length: %s bytes", len(data))
+                self.logger.debug("Requests method: JSON data (first 200 bytes): %s", data[:200])
+                self.logger.debug("Requests method: Request headers: %s", headers)
             
-            self.logger.info(f"[DEBUG] Requests method: About to send HTTP request to Discord...")
-            response = requests.post(
-                self.discord_webhook_url,
-                json=payload,  # Use json parameter for automatic JSON encoding
-                headers=headers
-            )
+            # Send request using requests library
+            self.logger.debug("Requests method: About to send HTTP POST to Discord...")
+            # A session reuses its connection, so only the first send pays for the TLS handshake
+            if self._http_session is None:
+                self._http_session = requests.Session()
+            response = self._http_session.post(self.discord_webhook_url, data=data, headers=headers, timeout=WEBHOOK_TIMEOUT)
+            wait = self._retry_after(response.status_code, response.headers)
+            if wait is not None:
+                time.sleep(wait)
+                response = self._http_session.post(self.discord_webhook_url, data=data, headers=headers, timeout=WEBHOOK_TIMEOUT)
             
-            self.logger.info(f"[DEBUG] Requests method: HTTP response received")
-            self.logger.info(f"[DEBUG] Requests method: Response status: {response.status_code}")
-            self.logger.info(f"[DEBUG] Requests method: Response headers: {dict(response.headers)}")
+            if debug:
+                self.logger.debug("Requests method: Response status: %s", response.status_code)
+                self.logger.debug("Requests method: Response headers: %s", dict(response.headers))
             
             if response.status_code == 204:  # Discord returns 204 on success
-                self.logger.info(f"Requests Discord webhook sent successfully: {payload.get('content', 'No content')}")
+                self.logger.info("Requests Discord webhook sent successfully: %s", payload.get('content', 'No content'))
                 return True
             else:
-                self.logger.error(f"Requests Discord webhook failed with status {response.status_code}")
-                self.logger.error(f"[DEBUG] Requests method: Response content: {response.text}")
+                self.logger.error("Requests Discord webhook failed with status %s", response.status_code)
+                self.logger.error("[DEBUG] Requests method: Response content: %s", response.text)
                 return False
                 
         except Exception as e:
-            self.logger.error(f"Error in requests method: {e}")
+            self.logger.error("Error in requests method: %s", e)
             return False
     
     def _send_with_urllib(self, payload: Dict) -> bool:
-        """Send Discord webhook using urllib library."""
+        """Send Discord webhook using the standard library, over a kept-alive connection."""
         try:
             # Convert payload to JSON
-            data = json.dumps(payload).encode('utf-8')
-            self.logger.info(f"[DEBUG] Urllib method: JSON data length: {len(data)} bytes")
-            self.logger.info(f"[DEBUG] Urllib method: JSON data (first 200 chars): {data[:200]}")
+            data = _dumps(payload)
+            url = urllib.parse.urlsplit(self.discord_webhook_url)
+            path = url.path + (f"?{url.query}" if url.query else "")
+            headers = {'Content-Type': 'application/json'}
+            debug = self.logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                self.logger.debug("Urllib method: JSON data length: %s bytes", len(data))
+                self.logger.debug("Urllib method: JSON data (first 200 bytes): %s", data[:200])
+                self.logger.debug("Urllib method: Request headers: %s", headers)
             
-            # Create request
-            req = urllib.request.Request(
-                self.discord_webhook_url,
-                data=data,
-                headers={'Content-Type': 'application/json'}
-            )
+            self.logger.debug("Urllib method: About to send HTTP POST to Discord...")
+            response = self._post_over_https_connection(url.netloc, path, data, headers)
+            wait = self._retry_after(response.status, response.headers)
+            if wait is not None:
+                time.sleep(wait)
+                response = self._post_over_https_connection(url.netloc, path, data, headers)
             
-            self.logger.info(f"[DEBUG] Urllib method: Request method: {req.get_method()}")
-            self.logger.info(f"[DEBUG] Urllib method: Request headers: {dict(req.headers)}")
-            self.logger.info(f"[DEBUG] Urllib method: Request data length: {len(req.data) if req.data else 0}")
+            if debug:
+                self.logger.debug("Urllib method: Response status: %s", response.status)
+                self.logger.debug("Urllib method: Response headers: %s", dict(response.headers))
             
-            # Send request
-            self.logger.info(f"[DEBUG] Urllib method: About to send HTTP request to Discord...")
-            with urllib.request.urlopen(req) as response:
-                self.logger.info(f"[DEBUG] Urllib method: HTTP response received")
-                self.logger.info(f"[DEBUG] Urllib method: Response status: {response.status}")
-                self.logger.info(f"[DEBUG] Urllib method: Response headers: {dict(response.headers)}")
-                
-                if response.status == 204:  # Discord returns 204 on success
-                    self.logger.info(f"Urllib Discord webhook sent successfully: {payload.get('content', 'No content')}")
-                    return True
-                else:
-                    self.logger.error(f"Urllib Discord webhook failed with status {response.status}")
-                    return False
+            if response.status == 204:  # Discord returns 204 on success
+                self.logger.info("Urllib Discord webhook sent successfully: %s", payload.get('content', 'No content'))
+                return True
+            else:
+                self.logger.error("Urllib Discord webhook failed with status %s", response.status)
+                return False
                     
         except Exception as e:
-            self.logger.error(f"Error in urllib method: {e}")
+            self.logger.error("Error in urllib method: %s", e)
             return False
 
+    def _post_over_https_connection(self, host: str, path: str, data: bytes,
+                                    headers: Dict[str, str]) -> http.client.HTTPResponse:
+        """POST over the kept-alive connection and return the read response.
+        
+        If the server closed the connection in the meantime, reconnect once and
+        send again.
+        """
+        for attempt in range(2):
+            if self._https_connection is None:
+                self._https_connection = http.client.HTTPSConnection(host, timeout=30)
+            try:
+                self._https_connection.request('POST', path, body=data, headers=headers)
+                response = self._https_connection.getresponse()
+                response.read()  # Drain the body so the connection can be reused
+                return response
+            except (http.client.HTTPException, ConnectionError):
+                self._https_connection.close()
+                self._https_connection = None
+                if attempt:
+                    raise
+    
+    def _retry_after(self, status: int, headers) -> Optional[float]:
+        """Seconds to wait before resending, if Discord rate limited the request (HTTP 429)."""
+        if status != 429:
+            return None
+        try:
+            wait = float(headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            wait = 1.0
+        wait = min(max(wait, 0.0), WEBHOOK_RATE_PERIOD)
+        self.logger.warning("Discord rate limited the webhook; retrying in %.1fs", wait)
+        return wait
+    
     def emit_discord_webhook_events(self, events: List[LogEvent] = None):
         """Emit events in Discord webhook format."""
         if events is None:
@@ -824,25 +1241,40 @@ class GrimObserver:
         
         print(f"\n=== Discord Webhook Payloads ({len(payloads)} events) ===")
         
-        for i, payload in enumerate(payloads, 1):
-            print(f"\n--- Event {i} ---")
-            print(f"Content: {payload['content']}")
-            if 'embeds' in payload and payload['embeds']:
-                embed = payload['embeds'][0]
-                print(f"Title: {embed.get('title', 'N/A')}")
-                print(f"Description: {embed.get('description', 'N/A')}")
-                print(f"Color: {embed.get('color', 'N/A')}")
-                if 'fields' in embed:
-                    for field in embed['fields']:
-                        print(f"  {field['name']}: {field['value']}")
-                print(f"Timestamp: {embed.get('timestamp', 'N/A')}")
-            
-            # Send webhook if URL is configured
-            if self.discord_webhook_url:
-                self.send_discord_webhook(payload)
+        # Sends run on a worker thread so printing carries on during network
+        # round trips. There is one worker because Discord shows messages in
+        # arrival order, and joins and leaves must stay in sequence.
+        with ThreadPoolExecutor(max_workers=1) as sender:
+            for i, payload in enumerate(payloads, 1):
+                print(f"\n--- Event {i} ---")
+                print(f"Content: {payload['content']}")
+                if 'embeds' in payload and payload['embeds']:
+                    embed = payload['embeds'][0]
+                    print(f"Title: {embed.get('title', 'N/A')}")
+                    print(f"Description: {embed.get('description', 'N/A')}")
+                    print(f"Color: {embed.get('color', 'N/A')}")
+                    if 'fields' in embed:
+                        for field in embed['fields']:
+                            print(f"  {field['name']}: {field['value']}")
+                    print(f"Timestamp: {embed.get('timestamp', 'N/A')}")
+                
+                # Send webhook if URL is configured
+                if self.discord_webhook_url:
+                    sender.submit(self._send_discord_webhook_paced, payload)
         
         print(f"\n=== End Discord Webhook Payloads ===")
     
+    def _send_discord_webhook_paced(self, payload: Dict) -> bool:
+        """Send a webhook, first waiting if the last WEBHOOK_RATE_LIMIT sends were too recent."""
+        sent = self._webhook_send_times
+        if len(sent) == sent.maxlen:
+            wait = sent[0] + WEBHOOK_RATE_PERIOD - time.monotonic()
+            if wait > 0:
+                self.logger.info("Waiting %.1fs for Discord rate limit", wait)
+                time.sleep(wait)
+        sent.append(time.monotonic())
+        return self.send_discord_webhook(payload)
+    
     def emit_all_events(self, events: List[LogEvent] = None):
         """Emit all events in Discord webhook-friendly format."""
         if events is None:
@@ -898,9 +1330,10 @@ class GrimObserver:
         if players:
             print(f"Player list: {', '.join(sorted(players))}")
         
-        # Calculate final player count
-        connected = sum(1 for e in events if e.event_type == 'player_connected')
-        disconnected = sum(1 for e in events if e.event_type == 'player_disconnected')
+        # Calculate final player count from the per-type grouping above rather
+        # than scanning the events again
+        connected = len(event_types.get('player_connected', ()))
+        disconnected = len(event_types.get('player_disconnected', ()))
         final_count = max(0, connected - disconnected)
         
         print(f"\nConnection events: {connected}")
@@ -924,33 +1357,38 @@ class GrimObserver:
     
     def get_player_count(self) -> int:
         """Calculate current player count based on events for the current map."""
-        # Track players who are currently online for this map only
-        online_players = set()
-        
-        for event in self.events:
-            # Only count events from the current map instance
-            # Since we're running separate instances per map, all events should be from the same map
-            # But we can add a safety check if needed
-            if event.event_type == 'player_connected':
-                online_players.add(event.player_name)
-            elif event.event_type == 'player_disconnected':
-                # Remove from online players when they disconnect
-                online_players.discard(event.player_name)
-        
-        return len(online_players)
+        # Streaming mode tracks who is online as events arrive
+        if self.stream_events:
+            return len(self.players_online)
+        
+        # Track players who are currently online for this map only. Since we're
+        # running separate instances per map, all events are from the same map.
+        # Only events added since the last call are replayed; if self.events was
+        # replaced or shrank, start over.
+        events = self.events
+        if events is not self._counted_events or len(events) < self._counted:
+            self._counted_events = events
+            self._counted = 0
+            self.players_online = set()
+            self.last_connections = {}
+        
+        for event in events[self._counted:]:
+            self._update_players_online(event)
+        self._counted = len(events)
+        
+        return len(self.players_online)
     
     def _get_session_duration(self, player_name: str) -> str:
         """Calculate session duration for a player who just disconnected."""
-        # Find the most recent connection event for this player
+        # Find the most recent connection event for this player; last_connections
+        # is brought up to date with the player count, so no history is searched
         # Note: Since we're running separate instances per map, all events are map-specific
         connection_time = None
-        connection_event = None
-        
-        for event in reversed(self.events):
-            if event.event_type == 'player_connected' and event.player_name == player_name:
-                connection_event = event
-                connection_time = self.parse_timestamp(event.timestamp)
-                break
+        self.get_player_count()
+        connection_event = self.last_connections.get(player_name)
+        if connection_event:
+            connection_time = self.parse_timestamp(connection_event.timestamp)
+        history = self._event_history()
         
         if connection_time and connection_time > 0:
             # Calculate duration from connection to now (approximate)
@@ -959,22 +1397,22 @@ class GrimObserver:
             duration_seconds = current_time - connection_time
             
             # Debug logging
-            self.logger.debug(f"Session duration calculation for {player_name}:")
-            self.logger.debug(f"  Connection timestamp: {connection_event.timestamp if connection_event else 'None'}")
-            self.logger.debug(f"  Parsed connection time: {connection_time}")
-            self.logger.debug(f"  Current time: {current_time}")
-            self.logger.debug(f"  Duration seconds: {duration_seconds}")
+            self.logger.debug("Session duration calculation for %s:", player_name)
+            self.logger.debug("  Connection timestamp: %s", connection_event.timestamp if connection_event else 'None')
+            self.logger.debug("  Parsed connection time: %s", connection_time)
+            self.logger.debug("  Current time: %s", current_time)
+            self.logger.debug("  Duration seconds: %s", duration_seconds)
             
             # Handle edge cases for duration calculation
             if duration_seconds < 0:
                 # Negative duration means timestamp parsing issue or timezone problem
-                self.logger.warning(f"Negative duration calculated for {player_name}: {duration_seconds}s")
+                self.logger.warning("Negative duration calculated for %s: %ss", player_name, duration_seconds)
                 
                 # Try to estimate duration based on event order if possible
-                if len(self.events) >= 2:
+                if len(history) >= 2:
                     # Look for the disconnect event timestamp
                     disconnect_time = None
-                    for event in reversed(self.events):
+                    for event in reversed(history):
                         if event.event_type == 'player_disconnected' and event.player_name == player_name:
                             disconnect_time = self.parse_timestamp(event.timestamp)
                             break
@@ -983,7 +1421,7 @@ class GrimObserver:
                         # Calculate duration between connect and disconnect events
                         event_duration = disconnect_time - connection_time
                         if event_duration > 0:
-                            self.logger.info(f"Using event-based duration for {player_name}: {event_duration}s")
+                            self.logger.info("Using event-based duration for %s: %ss", player_name, event_duration)
                             return self._format_duration(event_duration)
                 
                 # If we still can't get a valid duration, return a safe default
@@ -993,7 +1431,7 @@ class GrimObserver:
             else:
                 return self._format_duration(duration_seconds)
         else:
-            self.logger.warning(f"Could not find valid connection time for {player_name}")
+            self.logger.warning("Could not find valid connection time for %s", player_name)
             return "Unknown"
     
     def _format_duration(self, duration_seconds: float) -> str:
@@ -1295,7 +1733,11 @@ class GrimObserver:
     def get_recent_events(self, minutes: int = 10) -> List[LogEvent]:
         """Get events from the last N minutes."""
         cutoff_time = datetime.now(timezone.utc).timestamp() - (minutes * 60)
-        return [e for e in self.events if self.parse_timestamp(e.timestamp) > cutoff_time]
+        if self.stream_events and minutes * 60 <= RECENT_EVENT_WINDOW:
+            # Answer from the window instead of parsing every event's timestamp;
+            # self.events can be replaced or cleared, so it is always scanned
+            return [e for ts, e in self._recent if ts > cutoff_time]
+        return [e for e in self._event_history() if self.parse_timestamp(e.timestamp) > cutoff_time]
     
     def parse_timestamp(self, timestamp: str) -> float:
         """Parse timestamp string to Unix timestamp."""
@@ -1303,61 +1745,62 @@ class GrimObserver:
             # Convert [2025.08.09-22.09.34:324] to datetime
             dt_str = timestamp.replace('[', '').replace(']', '')
             
-            # Try multiple timestamp formats
-            formats_to_try = [
-                '%Y.%m.%d-%H.%M.%S:%f',  # [2025.08.09-22.09.34:324]
-                '%Y.%m.%d-%H.%M.%S',     # [2025.08.09-22.09.34]
-                '%Y-%m-%d %H:%M:%S',     # 2025-08-09 22:09:34
-                '%Y/%m/%d %H:%M:%S',     # 2025/08/09 22:09:34
-                '%m/%d/%Y %H:%M:%S',     # 08/09/2025 22:09:34
-            ]
-            
-            for fmt in formats_to_try:
-                try:
-                    dt = datetime.strptime(dt_str, fmt)
-                    # Make the parsed datetime timezone-aware by assuming UTC
-                    dt = dt.replace(tzinfo=timezone.utc)
-                    
-                    # Handle timezone issues: server timestamps might be in different timezone
-                    # Use UTC time for consistent comparison
-                    current_utc = datetime.now(timezone.utc)
-                    server_time = dt
-                    
-                    # If server time is more than 24 hours in the future relative to current time,
-                    # assume it's a timezone issue and adjust
-                    time_diff = (server_time - current_utc).total_seconds()
-                    if time_diff > 86400:  # More than 24 hours ahead
-                        # Server time is likely in a different timezone, treat as relative
-                        # Use current time as baseline and calculate relative duration
-                        self.logger.debug(f"Server timestamp '{timestamp}' appears to be in different timezone, adjusting calculation")
-                        # Don't subtract time_diff as it would make it negative
-                        # Instead, treat it as a relative offset from current time
-                        return current_utc.timestamp()
-                    elif time_diff < -86400:  # More than 24 hours behind
-                        # Server time is likely in the past, treat as relative
-                        self.logger.debug(f"Server timestamp '{timestamp}' appears to be in the past, adjusting calculation")
-                        # Don't add abs(time_diff) as it would make it far in the future
-                        # Instead, treat it as a relative offset from current time
-                        return current_utc.timestamp()
-                    else:
-                        # Server time is within reasonable range, use as-is
+            # Log timestamps take the fast path; strptime is only for other formats
+            unix_timestamp = _parse_log_time(dt_str)
+            fmt = '%Y.%m.%d-%H.%M.%S:%f'
+            if unix_timestamp is None:
+                # Try multiple timestamp formats
+                formats_to_try = [
+                    '%Y.%m.%d-%H.%M.%S:%f',  # [2025.08.09-22.09.34:324]
+                    '%Y.%m.%d-%H.%M.%S',     # [2025.08.09-22.09.34]
+                    '%Y-%m-%d %H:%M:%S',     # 2025-08-09 22:09:34
+                    '%Y/%m/%d %H:%M:%S',     # 2025/08/09 22:09:34
+                    '%m/%d/%Y %H:%M:%S',     # 08/09/2025 22:09:34
+                ]
+                
+                for fmt in formats_to_try:
+                    try:
+                        # Make the parsed datetime timezone-aware by assuming UTC
+                        dt = datetime.strptime(dt_str, fmt).replace(tzinfo=timezone.utc)
                         unix_timestamp = dt.timestamp()
-                        
-                        # Additional validation: ensure timestamp is not too far in the past or future
-                        current_timestamp = current_utc.timestamp()
-                        if abs(unix_timestamp - current_timestamp) > 86400 * 365:  # More than 1 year difference
-                            self.logger.warning(f"Timestamp '{timestamp}' is more than 1 year from current time, using current time instead")
-                            return current_timestamp
-                        
-                        self.logger.debug(f"Server timestamp '{timestamp}' parsed successfully with format '{fmt}' -> {unix_timestamp}")
-                        return unix_timestamp
-                        
-                except ValueError:
-                    continue
+                        break
+                    except ValueError:
+                        continue
             
-            # If none of the formats worked, log the original timestamp
-            self.logger.error(f"Could not parse timestamp '{timestamp}' with any known format")
-            return 0
+            if unix_timestamp is None:
+                # If none of the formats worked, log the original timestamp
+                self.logger.error(f"Could not parse timestamp '{timestamp}' with any known format")
+                return 0
+            
+            # Handle timezone issues: server timestamps might be in different timezone
+            # Use UTC time for consistent comparison
+            current_timestamp = time.time()
+            
+            # If server time is more than 24 hours in the future relative to current time,
+            # assume it's a timezone issue and adjust
+            time_diff = unix_timestamp - current_timestamp
+            if time_diff > 86400:  # More than 24 hours ahead
+                # Server time is likely in a different timezone, treat as relative
+                # Use current time as baseline and calculate relative duration
+                self.logger.debug("Server timestamp '%s' appears to be in different timezone, adjusting calculation", timestamp)
+                # Don't subtract time_diff as it would make it negative
+                # Instead, treat it as a relative offset from current time
+                return current_timestamp
+            elif time_diff < -86400:  # More than 24 hours behind
+                # Server time is likely in the past, treat as relative
+                self.logger.debug("Server timestamp '%s' appears to be in the past, adjusting calculation", timestamp)
+                # Don't add abs(time_diff) as it would make it far in the future
+                # Instead, treat it as a relative offset from current time
+                return current_timestamp
+            else:
+                # Server time is within reasonable range, use as-is
+                # Additional validation: ensure timestamp is not too far in the past or future
+                if abs(unix_timestamp - current_timestamp) > 86400 * 365:  # More than 1 year difference
+                    self.logger.warning(f"Timestamp '{timestamp}' is more than 1 year from current time, using current time instead")
+                    return current_timestamp
+                
+                self.logger.debug("Server timestamp '%s' parsed successfully with format '%s' -> %s", timestamp, fmt, unix_timestamp)
+                return unix_timestamp
             
         except Exception as e:
             self.logger.error(f"Failed to parse timestamp '{timestamp}': {e}")
@@ -1371,39 +1814,76 @@ class GrimObserver:
         self.running = True
         self.current_position = self.get_current_position()
         
-        # Track when we last checked for new log files
-        last_log_file_check = time.time()
+        # Deadlines for the periodic checks, on the monotonic clock so wall-clock
+        # adjustments can't skip or repeat them
         log_file_check_interval = 60  # Check for new log files every 60 seconds
+        status_interval = 30  # Print status every 30 seconds
+        next_log_file_check = time.monotonic() + log_file_check_interval
+        next_status = time.monotonic() + status_interval
+        
+        watcher = self._create_log_watcher()
         
         try:
             while self.running:
                 # Check for new log files periodically
-                current_time = time.time()
-                if current_time - last_log_file_check >= log_file_check_interval:
+                now = time.monotonic()
+                if now >= next_log_file_check:
                     if self.switch_to_active_log_file():
                         # If we switched files, update the position
                         self.current_position = self.get_current_position()
-                    last_log_file_check = current_time
+                    next_log_file_check = now + log_file_check_interval
                 
                 new_lines = self.read_new_lines()
                 
+                # Lines are parsed undecoded; only event fields get decoded
                 for line in new_lines:
-                    self.process_line(line)
+                    self.process_line_bytes(line)
+                # Write this poll's events together
+                self.flush()
                 
                 # Print status every 30 seconds
-                if len(self.events) > 0 and int(time.time()) % 30 == 0:
-                    player_count = self.get_player_count()
-                    self.logger.info(f"Current player count: {player_count}")
+                if now >= next_status:
+                    next_status = now + status_interval
+                    if len(self._event_history()) > 0:
+                        player_count = self.get_player_count()
+                        self.logger.info(f"Current player count: {player_count}")
                 
-                time.sleep(interval)
+                if watcher:
+                    # Sleep until the log directory changes or the next periodic check
+                    # is due. After a change, wait out the interval so a busy log
+                    # still wakes us at most once per interval.
+                    timeout = max(min(next_log_file_check, next_status) - time.monotonic(), interval)
+                    watcher.read(timeout=int(timeout * 1000), read_delay=int(interval * 1000))
+                else:
+                    time.sleep(interval)
                 
         except KeyboardInterrupt:
             self.logger.info("Monitoring stopped by user")
         except Exception as e:
             self.logger.error(f"Error in monitoring loop: {e}")
         finally:
+            self.flush()
+            if watcher:
+                watcher.close()
+            self._close_log_file()
+            self._close_output_file()
+            self._close_webhook_sender()
             self.running = False
     
+    def _create_log_watcher(self):
+        """Watch the log file's directory for writes and new files, or return None to poll."""
+        if not INOTIFY_AVAILABLE:
+            return None
+        try:
+            watcher = INotify()
+            log_directory = os.path.dirname(os.path.abspath(self.log_file_path))
+            watcher.add_watch(log_directory, inotify_flags.MODIFY | inotify_flags.CREATE | inotify_flags.MOVED_TO)
+            self.logger.info(f"Waiting for changes in {log_directory} with inotify")
+            return watcher
+        except OSError as e:
+            self.logger.warning(f"inotify unavailable, polling instead: {e}")
+            return None
+    
     def stop(self):
         """Stop the monitoring."""
         self.running = False
@@ -1419,8 +1899,8 @@ class GrimObserver:
         payloads = self.generate_discord_webhook_payloads(events)
         
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(payloads, f, indent=2)
+            with open(output_file, 'wb') as f:
+                f.write(_dumps(payloads, indent=True))
             self.logger.info(f"Saved {len(payloads)} Discord webhook payloads to {output_file}")
             return output_file
         except Exception as e:
@@ -1435,13 +1915,9 @@ class GrimObserver:
         if not events:
             return
         
-        # Generate Discord webhook payloads
-        payloads = self.generate_discord_webhook_payloads(events)
-        
-        # Only show player join/leave events (green and red messages)
-        for event, payload in zip(events, payloads):
-            if event.event_type in ['player_connected', 'player_disconnected']:
-                print(payload['content'])
+        # Only player join/leave events (green and red messages) have content;
+        # write the text directly, without building payload dicts, in one call
+        sys.stdout.writelines(content + '\n' for content in self._webhook_contents(events))
 
     def debug_timestamp_parsing(self, sample_lines: List[str] = None):
         """Debug timestamp parsing by testing sample log lines."""
@@ -1603,6 +2079,29 @@ def load_secrets(map_name: Optional[str] = None) -> Dict[str, str]:
     print(f"[DEBUG] Final secrets loaded: {secrets}", file=sys.stderr)
     return secrets
 
+def _emit_scan_results(observer: GrimObserver, args: argparse.Namespace, events: List[LogEvent]):
+    """Print the events found by a scan in the format chosen on the command line
+    and save them to the output file if one was given."""
+    if args.webhook_only:
+        # Webhook-only mode: show only the webhook content
+        observer.emit_webhook_content_only(events)
+    elif args.discord:
+        # Discord webhook mode
+        observer.emit_discord_webhook_events(events)
+        
+        # Save Discord webhook payloads if specified
+        observer.save_discord_webhook_payloads(events, args.discord_output)
+    else:
+        # Normal scan mode
+        observer.emit_all_events(events)
+    
+    # Save to output file if specified
+    if args.output:
+        print(f"\nSaving all events to: {args.output}")
+        observer.save_events(events)
+        print(f"Saved {len(events)} events to {args.output}")
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description='Monitor Conan Exiles server logs for player events')
@@ -1626,6 +2125,7 @@ def main():
     parser.add_argument('--debug-timestamps', action='store_true', help='Enable timestamp parsing debugging to troubleshoot duration issues')
     parser.add_argument('--auto-detect-log', action='store_true', help='Auto-detect the most recent log file in the specified directory')
     parser.add_argument('--log-directory', help='Directory to search for log files (overrides log_file argument)')
+    parser.add_argument('--max-events', type=int, default=100000, help='Most events kept in memory while monitoring; the oldest are dropped (0 for no limit)')
     
     args = parser.parse_args()
     
@@ -1695,7 +2195,9 @@ def main():
             output_file=args.output,
             empty_server_message_interval=args.empty_interval * 3600,  # Convert hours to seconds
             use_rich_embeds=not args.no_rich_embeds,
-            force_curl=args.force_curl
+            force_curl=args.force_curl,
+            buffer_output=True,  # The monitoring loop flushes after each poll
+            max_events=args.max_events
         )
         
         # Apply custom image URLs if provided
@@ -1716,28 +2218,7 @@ def main():
             events = observer.scan_entire_log()
             observer.events = events  # Store events for other operations
             
-            if args.webhook_only:
-                # Webhook-only mode: show only the webhook content
-                observer.emit_webhook_content_only(events)
-            elif args.discord:
-                # Discord webhook mode
-                observer.emit_discord_webhook_events(events)
-                
-                # Save Discord webhook payloads if specified
-                if args.discord_output:
-                    observer.save_discord_webhook_payloads(events, args.discord_output)
-                else:
-                    observer.save_discord_webhook_payloads(events)
-            else:
-                # Normal scan mode
-                observer.emit_all_events(events)
-            
-            # Save to output file if specified
-            if args.output:
-                print(f"\nSaving all events to: {args.output}")
-                for event in events:
-                    observer.save_event(event)
-                print(f"Saved {len(events)} events to {args.output}")
+            _emit_scan_results(observer, args, events)
         
         elif args.mode == 'scan-monitor':
             # Scan-monitor mode: scan entire log first, then continue monitoring
@@ -1748,28 +2229,7 @@ def main():
             events = observer.scan_entire_log()
             observer.events = events  # Store events for other operations
             
-            if args.webhook_only:
-                # Webhook-only mode: show only the webhook content
-                observer.emit_webhook_content_only(events)
-            elif args.discord:
-                # Discord webhook mode
-                observer.emit_discord_webhook_events(events)
-                
-                # Save Discord webhook payloads if specified
-                if args.discord_output:
-                    observer.save_discord_webhook_payloads(events, args.discord_output)
-                else:
-                    observer.save_discord_webhook_payloads(events)
-            else:
-                # Normal scan mode
-                observer.emit_all_events(events)
-            
-            # Save to output file if specified
-            if args.output:
-                print(f"\nSaving all events to: {args.output}")
-                for event in events:
-                    observer.save_event(event)
-                print(f"Saved {len(events)} events to {args.output}")
+            _emit_scan_results(observer, args, events)
             
             print(f"\n[GrimObserver][INFO] Phase 2: Starting continuous monitoring for new events...")
             print("[GrimObserver][INFO] Press Ctrl+C to stop monitoring")
@@ -5,7 +5,9 @@ Bundles all tests into a single script with summarized results
 """
 
 import sys
+import json
 import os
+import re
 import time
 import tempfile
 import subprocess
@@ -97,9 +99,23 @@ class GrimObserverTestSuite:
             ]
             
             all_passed = True
+            
+            # Patterns must be compiled once, up front
+            compiled = list(parser.patterns.values()) + list(parser.byte_patterns.values())
+            if not all(isinstance(p, re.Pattern) for p in compiled):
+                print(f"   ✗ Parser has uncompiled patterns")
+                all_passed = False
+            
             for test_name, test_line, expected_type, expected_player in test_cases:
                 event = parser.parse_line(test_line)
                 
+                # The binary-mode parser must agree with the text one
+                byte_event = parser.parse_line_bytes(test_line.encode('utf-8'))
+                fields = lambda e: e and (e.timestamp, e.event_type, e.player_name, e.ip_address, e.player_id, e.raw_line)
+                if fields(byte_event) != fields(event):
+                    print(f"   ✗ {test_name}: Binary parse differs: {byte_event}")
+                    all_passed = False
+                
                 # Handle filtered out cases (expected_type is None)
                 if expected_type is None:
                     if event is None:
@@ -295,6 +311,195 @@ class GrimObserverTestSuite:
             print(f"   Empty server message test error: {e}")
             return False
     
+    def test_streaming_mode(self):
+        """Test that streaming mode tracks player state without retaining events"""
+        try:
+            from grim_observer import GrimObserver
+            
+            # Create temporary log file
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.log', delete=False) as temp_file:
+                temp_file.write("Dummy log content for testing\n")
+                temp_log_path = temp_file.name
+            output_path = temp_log_path + ".events.json"
+            
+            try:
+                observer = GrimObserver(
+                    log_file_path=temp_log_path,
+                    output_file=output_path,
+                    discord_webhook_url=None,
+                    stream_events=True,
+                    buffer_output=True
+                )
+                seen = []
+                observer.on_event = seen.append
+                
+                lines = [
+                    "[2025.08.09-22.00.01:000][2]BattlEyeLogging: BattlEyeServer: Print Message: Player #0 Alice (192.168.1.100:12345) connected",
+                    "[2025.08.09-22.00.02:000][3]BattlEyeLogging: BattlEyeServer: Print Message: Player #1 Bob (192.168.1.101:12345) connected",
+                    "[2025.08.09-22.00.03:000][4]BattlEyeLogging: BattlEyeServer: Print Message: Player #0 Alice disconnected",
+                    "[2025.08.09-22.00.04:000][5]LogServerStats: Status report. Players=1",
+                ]
+                for line in lines:
+                    observer.process_line(line)
+                
+                if observer.events:
+                    print(f"   ✗ Streaming mode retained {len(observer.events)} events")
+                    return False
+                if len(seen) != 3 or observer.get_player_count() != 1:
+                    print(f"   ✗ Streaming mode state wrong: {len(seen)} events, {observer.get_player_count()} players")
+                    return False
+                
+                # Recent lookups are answered from the observer's time window
+                recent = observer.get_recent_events(minutes=10)
+                if [e.player_name for e in recent] != ['Alice', 'Bob', 'Alice']:
+                    print(f"   ✗ Recent events wrong: {[str(e) for e in recent]}")
+                    return False
+                
+                # Buffered events reach the output file only on flush
+                if os.path.exists(output_path):
+                    print(f"   ✗ Buffered events were written before flush")
+                    return False
+                written = observer.flush()
+                if written != os.path.getsize(output_path):
+                    print(f"   ✗ flush() reported {written} bytes, file has {os.path.getsize(output_path)}")
+                    return False
+                with open(output_path, 'r', encoding='utf-8') as f:
+                    saved = [json.loads(line) for line in f]
+                if [e['player_name'] for e in saved] != ['Alice', 'Bob', 'Alice']:
+                    print(f"   ✗ Flushed output wrong: {saved}")
+                    return False
+                
+                print(f"   ✓ Streamed {len(seen)} events, player count {observer.get_player_count()}")
+                return True
+                
+            finally:
+                # Clean up
+                for path in (temp_log_path, output_path):
+                    try:
+                        os.unlink(path)
+                    except:
+                        pass
+                    
+        except Exception as e:
+            print(f"   Streaming mode test error: {e}")
+            return False
+    
+    def test_player_count(self):
+        """Test player counting as events arrive and when the event list is replaced"""
+        try:
+            from grim_observer import GrimObserver
+            
+            # Create temporary log file
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.log', delete=False) as temp_file:
+                temp_file.write("Dummy log content for testing\n")
+                temp_log_path = temp_file.name
+            output_path = temp_log_path + ".events.json"
+            
+            try:
+                observer = GrimObserver(
+                    log_file_path=temp_log_path,
+                    output_file=output_path,
+                    discord_webhook_url=None
+                )
+                
+                counts = []
+                for line in [
+                    "[2025.08.09-22.00.01:000][2]BattlEyeLogging: BattlEyeServer: Print Message: Player #0 Alice (192.168.1.100:12345) connected",
+                    "[2025.08.09-22.00.02:000][3]BattlEyeLogging: BattlEyeServer: Print Message: Player #1 Bob (192.168.1.101:12345) connected",
+                    "[2025.08.09-22.00.03:000][4]BattlEyeLogging: BattlEyeServer: Print Message: Player #0 Alice disconnected",
+                    "[2025.08.09-22.00.03:500][5]LogNet: Player disconnected: Alice",
+                ]:
+                    observer.process_line(line)
+                    counts.append(observer.get_player_count())
+                
+                if counts != [1, 2, 1, 1]:
+                    print(f"   ✗ Player counts wrong: {counts}")
+                    return False
+                
+                # Replacing the event list (as the scan modes do) starts the count over
+                observer.events = observer.events[:1]
+                if observer.get_player_count() != 1:
+                    print(f"   ✗ Player count after replacing events: {observer.get_player_count()}")
+                    return False
+                
+                # Dropping old events past max_events keeps the count intact
+                observer.events = []
+                observer.max_events = 4
+                for i in range(6):
+                    observer.process_line(
+                        f"[2025.08.09-22.01.0{i}:000][6]BattlEyeLogging: BattlEyeServer: Print Message: "
+                        f"Player #{i} Player{i} (192.168.1.{i}:12345) connected"
+                    )
+                if len(observer.events) > 4 or observer.get_player_count() != 6:
+                    print(f"   ✗ Capped events: {len(observer.events)} kept, count {observer.get_player_count()}")
+                    return False
+
+                print(f"   ✓ Player counts: {counts}")
+                return True
+                
+            finally:
+                # Clean up
+                for path in (temp_log_path, output_path):
+                    try:
+                        os.unlink(path)
+                    except:
+                        pass
+                    
+        except Exception as e:
+            print(f"   Player count test error: {e}")
+            return False
+    
+    def test_process_file(self):
+        """Test that whole-file scans find the same events as parsing line by line"""
+        try:
+            sample_log_path = Path(__file__).parent / "tests" / "conansandbox.sample.log"
+            
+            if not sample_log_path.exists():
+                print(f"   ⚠️  Sample log file not found: {sample_log_path}")
+                return True  # Skip this test if file doesn't exist
+            
+            from grim_observer import ConanLogParser, GrimObserver
+            
+            parser = ConanLogParser()
+            with open(sample_log_path, 'r', encoding='utf-8', errors='ignore') as f:
+                parsed = [parser.parse_line(line) for line in f]
+            expected = [str(e) for e in parsed if e]
+            total_lines = len(parsed)
+            
+            with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as temp_file:
+                output_path = temp_file.name
+            
+            try:
+                observer = GrimObserver(log_file_path=str(sample_log_path), output_file=output_path)
+                scanned = [str(e) for e in observer.scan_entire_log()]
+                if scanned != expected:
+                    print(f"   ✗ scan_entire_log found {len(scanned)} events, line-by-line parsing found {len(expected)}")
+                    return False
+                
+                found = observer.process_file()
+                actual = [str(e) for e in observer.events]
+                
+                if found != len(actual) or actual != expected:
+                    print(f"   ✗ process_file found {found} events, line-by-line scan found {len(expected)}")
+                    return False
+                if observer.lines_processed != total_lines:
+                    print(f"   ✗ process_file counted {observer.lines_processed} lines, expected {total_lines}")
+                    return False
+                
+                print(f"   ✓ Found {found} events in {observer.lines_processed} lines")
+                return True
+                
+            finally:
+                # Clean up
+                try:
+                    os.unlink(output_path)
+                except:
+                    pass
+                    
+        except Exception as e:
+            print(f"   Process file test error: {e}")
+            return False
+    
     def test_command_line_interface(self):
         """Test command-line interface"""
         try:
@@ -367,6 +572,9 @@ class GrimObserverTestSuite:
             ("Constructor", self.test_constructor),
             ("Session Duration", self.test_session_duration),
             ("Empty Server Messages", self.test_empty_server_messages),
+            ("Streaming Mode", self.test_streaming_mode),
+            ("Player Count", self.test_player_count),
+            ("Whole-File Scan", self.test_process_file),
             ("Command Line Interface", self.test_command_line_interface),
             ("Scan Mode", self.test_scan_mode),
         ]